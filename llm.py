@@ -1,5 +1,6 @@
 import os
 import dotenv as env
+from functools import lru_cache
 from google import genai
 from google.genai import types
 import pathlib
@@ -9,22 +10,17 @@ import random
 
 env.load_dotenv()
 
-# Client will be initialized when needed
-client = None
-
 # Global variables to store parameters (set by main.py)
 user_query = ""
 news_number = 10
 
+@lru_cache(maxsize=1)
 def get_gemini_client():
-    """Get or initialize the Gemini client"""
-    global client
-    if client is None:
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable not set")
-        client = genai.Client(api_key=api_key)
-    return client
+    """Get or initialize the Gemini client (created once, on first use)"""
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY environment variable not set")
+    return genai.Client(api_key=api_key)
 
 # Remove this line that asks for user input:
 # news_number = int(input("How many news articles do you want to fetch? (default is 10): ") or 10)
@@ -249,57 +245,62 @@ Analyze the provided news collection and, if necessary, use Google Search to fin
         
         # Save the curated results with detailed summaries
         output_filename = f"data/curated_news_{news_number}_articles.txt"
-        with open(output_filename, "w", encoding="utf-8") as f:
-            f.write("="*80 + "\n")
-            f.write("EXPERT NEWS CURATION RESULTS\n")
-            f.write("="*80 + "\n")
-            f.write(f"Original Query: {user_query}\n")
-            f.write(f"Requested Articles: {news_number}\n")
-            f.write(f"Selected Articles: {len(selected_articles)}\n")
-            f.write(f"Research Sources: Original Document + Google Search + Newspaper3k Analysis\n")
-            f.write("="*80 + "\n\n")
+        # Build the whole report first, then write it in one call
+        parts = []
+        parts.append("="*80 + "\n")
+        parts.append("EXPERT NEWS CURATION RESULTS\n")
+        parts.append("="*80 + "\n")
+        parts.append(f"Original Query: {user_query}\n")
+        parts.append(f"Requested Articles: {news_number}\n")
+        parts.append(f"Selected Articles: {len(selected_articles)}\n")
+        parts.append(f"Research Sources: Original Document + Google Search + Gemini Summaries + Newspaper3k Analysis\n")
+        parts.append("="*80 + "\n\n")
+        
+        parts.append("CURATION METHODOLOGY\n")
+        parts.append("-" * 40 + "\n")
+        parts.append("Each article was selected based on relevance, quality, recency, source credibility, and uniqueness.\n")
+        parts.append("Candidate articles were summarized by Gemini from their full text, with newspaper3k extraction as a fallback.\n")
+        parts.append("The detailed summary under each article below was extracted using newspaper3k.\n\n")
+        
+        # Process each selected article
+        for idx, article in enumerate(selected_articles, 1):
+            parts.append(f"📰 ARTICLE {idx}\n")
+            parts.append("=" * 50 + "\n")
+            parts.append(f"🏆 RANK: {idx}/{len(selected_articles)}\n")
+            parts.append(f"📰 TITLE: {article['title']}\n")
+            parts.append(f"🔗 URL: {article['url']}\n")
             
-            f.write("CURATION METHODOLOGY\n")
-            f.write("-" * 40 + "\n")
-            f.write("Each article was selected based on relevance, quality, recency, source credibility, and uniqueness.\n")
-            f.write("Summaries were extracted using newspaper3k for accurate content analysis.\n\n")
+            if article.get('source'):
+                parts.append(f"📰 SOURCE: {article['source']}\n")
             
-            # Process each selected article
-            for idx, article in enumerate(selected_articles, 1):
-                f.write(f"📰 ARTICLE {idx}\n")
-                f.write("=" * 50 + "\n")
-                f.write(f"🏆 RANK: {idx}/{len(selected_articles)}\n")
-                f.write(f"📰 TITLE: {article['title']}\n")
-                f.write(f"🔗 URL: {article['url']}\n")
-                
-                if article.get('source'):
-                    f.write(f"📰 SOURCE: {article['source']}\n")
-                
-                if article.get('published_at'):
-                    f.write(f"📅 PUBLISHED: {article['published_at']}\n")
-                
-                f.write("\n📋 LLM SUMMARY:\n")
-                f.write("-" * 30 + "\n")
-                f.write(f"{article.get('llm_summary', 'No summary provided')}\n\n")
-                
-                f.write("📄 NEWSPAPER3K SUMMARY:\n")
-                f.write("-" * 30 + "\n")
-                f.write(f"{article.get('newspaper_summary', 'Could not extract summary')}\n\n")
-                
-                f.write("🎯 WHY THIS ARTICLE WAS SELECTED:\n")
-                f.write("-" * 30 + "\n")
-                f.write(f"This article was selected for its high relevance to '{user_query}', ")
-                f.write("comprehensive coverage, credible source, and unique insights.\n\n")
-                
-                f.write("="*80 + "\n\n")
+            if article.get('published_at'):
+                parts.append(f"📅 PUBLISHED: {article['published_at']}\n")
+            
+            parts.append("\n📋 LLM SUMMARY:\n")
+            parts.append("-" * 30 + "\n")
+            parts.append(f"{article.get('llm_summary', 'No summary provided')}\n\n")
+            
+            parts.append("📄 NEWSPAPER3K SUMMARY:\n")
+            parts.append("-" * 30 + "\n")
+            parts.append(f"{article.get('newspaper_summary', 'Could not extract summary')}\n\n")
             
-            f.write("🎯 CURATION SUMMARY\n")
-            f.write("="*50 + "\n")
-            f.write(f"Total articles analyzed: Multiple sources\n")
-            f.write(f"Articles selected: {len(selected_articles)}\n")
-            f.write(f"Selection criteria: Relevance (40%), Quality (25%), Recency (20%), Credibility (10%), Uniqueness (5%)\n")
-            f.write(f"Enhanced with: Google Search + Newspaper3k Summary Extraction\n")
-            f.write("="*80 + "\n")
+            parts.append("🎯 WHY THIS ARTICLE WAS SELECTED:\n")
+            parts.append("-" * 30 + "\n")
+            parts.append(f"This article was selected for its high relevance to '{user_query}', ")
+            parts.append("comprehensive coverage, credible source, and unique insights.\n\n")
+            
+            parts.append("="*80 + "\n\n")
+        
+        parts.append("🎯 CURATION SUMMARY\n")
+        parts.append("="*50 + "\n")
+        parts.append(f"Total articles analyzed: Multiple sources\n")
+        parts.append(f"Articles selected: {len(selected_articles)}\n")
+        parts.append(f"Selection criteria: Relevance (40%), Quality (25%), Recency (20%), Credibility (10%), Uniqueness (5%)\n")
+        parts.append(f"Enhanced with: Google Search + Newspaper3k Summary Extraction\n")
+        parts.append("="*80 + "\n")
+
+        with open(output_filename, "w", encoding="utf-8") as f:
+            f.write("".join(parts))
 
         print(f"\n✅ Expert curation completed!")
         print(f"Results saved to: {output_filename}")
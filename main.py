@@ -1,13 +1,18 @@
 import os
 import logging
 import asyncio
-from datetime import datetime, timedelta
+from datetime import timedelta, time as dt_time
 import schedule
 import time
 import threading
 import re
 import shutil
+from collections import OrderedDict
+from functools import lru_cache
+from urllib.parse import urlparse
+from aiolimiter import AsyncLimiter
 from telegram import Update, ReplyKeyboardMarkup, ReplyKeyboardRemove
+from telegram.error import RetryAfter
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ConversationHandler, ContextTypes
 import dotenv as env
 
@@ -20,28 +25,220 @@ import curatex_bot
 
 env.load_dotenv()
 
-# Enable logging
+# Enable logging (set LOG_LEVEL=WARNING in production to skip per-article info logs)
 logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
+    level=os.getenv('LOG_LEVEL', 'INFO').upper()
 )
 logger = logging.getLogger(__name__)
 
 # Conversation states
 QUERY, NEWS_COUNT, DELIVERY_TIME, CONFIRM = range(4)
 
+# Delivery time in 12-hour (02:30 PM) or 24-hour (14:30) format
+TIME_RE = re.compile(r'^\s*(\d{1,2}):(\d{2})(?:\s*([AaPp][Mm]))?\s*$')
+
+# Greeting words (matched as whole words) and reply-keyboard commands
+GREETINGS = frozenset({'hi', 'hello', 'hey', 'start', 'begin'})
+WORD_RE = re.compile(r'[a-z]+')
+COMMAND_RE = re.compile(r'/(?:input|help|start)')
+
+# How many times a reply is retried after Telegram flood control (RetryAfter)
+MAX_SEND_RETRIES = 3
+
+# Per-chat rate limiters kept for the most recently active chats; a chat idle
+# long enough to be evicted has no pacing left to enforce
+MAX_CHAT_LIMITERS = 1024
+
+# Precompiled patterns for the article parsers (parse_news_articles and helpers)
+ARTICLE_HEAD_RE = re.compile(r'📰 ARTICLE (\d+)\n=+\n')
+NUMBERED_HEAD_RE = re.compile(r'^(\d+)\.[ \t]*([^\n]+)$', re.MULTILINE)
+TITLE_PATTERN_RES = (
+    re.compile(r'(?:Title:|\*\*.*?\*\*|###.*?)\s*([^\n]+)\n(.*?)(?=(?:Title:|\*\*.*?\*\*|###.*?)|\Z)', re.DOTALL),
+    re.compile(r'([A-Z][^\n]{20,})\n(.*?)(?=\n[A-Z][^\n]{20,}|\Z)', re.DOTALL),
+)
+# Separators tried in order when splitting unstructured content into articles
+ARTICLE_SEPARATORS = ('\n---\n', '\n===\n', '\n***\n', '\n\n\n')
+# Leading "1." numbering and ** bold markers stripped from titles
+TITLE_CLEAN_RE = re.compile(r'^\d+\.\s*|\*\*')
+LINK_RE = re.compile(r'https?://[^\s\n)]+|www\.[^\s\n)]+|[^\s\n]+\.[a-z]{2,}[^\s\n]*', re.IGNORECASE)
+# Tried in order: explicit source labels (one alternation, first label in the
+# text wins), then the name heuristics
+SOURCE_RES = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(?:Source|From|Via|Published by):\s*([^\n]+)',
+    r'- ([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # Common news source names
+    r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:\s+News|\s+Times|\s+Post|\s+Herald|\s+Tribune|\s+Journal|\s+Today|\s+CNN|\s+BBC|\s+Reuters|\s+AP|\s+Bloomberg))',
+))
+# URLs and source-label lines removed from article bodies in one pass
+SUMMARY_STRIP_RE = re.compile(r'https?://\S+|(?:Source|From|Via|Published by):.*?(?=\n|$)', re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+MARKDOWN_STRIP_TABLE = str.maketrans('', '', '*_`[](){}#~|\\')
+EXTRA_NEWLINES_RE = re.compile(r'\n{3,}')
+SPACES_RE = re.compile(r'[ \t]+')
+UNSAFE_CHARS_RE = re.compile(r'[^\w\s\-.,!?:;"\'/\n]')
+# Fields of the emoji-labelled curated article format
+CURATED_TITLE_RE = re.compile(r'📰 TITLE:\s*([^\n]+)')
+CURATED_URL_RE = re.compile(r'🔗 URL:\s*([^\n]+)')
+CURATED_SOURCE_RE = re.compile(r'📰 SOURCE:\s*([^\n]+)')
+CURATED_NEWSPAPER_SUMMARY_RE = re.compile(r'📄 NEWSPAPER3K SUMMARY:\n-+\n(.*?)(?=🎯 WHY THIS ARTICLE|$)', re.DOTALL)
+CURATED_LLM_SUMMARY_RE = re.compile(r'📋 LLM SUMMARY:\n-+\n(.*?)(?=📄 NEWSPAPER3K SUMMARY|🎯 WHY THIS ARTICLE|$)', re.DOTALL)
+# Lines starting with one of these markers are labels, not summary text
+SUMMARY_SKIP_CHARS = frozenset('📰🔗📄📋🎯🏆📅-')
+DEBUG_PATTERNS = {
+    'curated_articles': re.compile(r'📰 ARTICLE \d+'),
+    'numbered_articles': re.compile(r'\d+\.\s*[^\n]+'),
+    'title_patterns': re.compile(r'📰 TITLE:\s*[^\n]+'),
+    'url_patterns': re.compile(r'🔗 URL:\s*[^\n]+'),
+    'source_patterns': re.compile(r'📰 SOURCE:\s*[^\n]+'),
+    'bold_titles': re.compile(r'\*\*[^\*]+\*\*'),
+    'urls': re.compile(r'https?://[^\s\n]+'),
+    'separators': re.compile(r'---+|===+|\*\*\*+'),
+}
+
+# Characters that must be backslash-escaped in Telegram MarkdownV2 text
+MARKDOWN_V2_SPECIAL_RE = re.compile(r'([_*\[\]()~`>#+\-=|{}.!\\])')
+
 # User data storage
 user_sessions = {}
 
 # Track users who have received news and can ask questions
 users_with_news_context = set()
 
+# Intermediate files removed after a delivery
+TEMP_FILES = ('data/news_results.txt', 'messages_to_user.txt')
+
+# Welcome text shared by /start and the greeting handler
+WELCOME_MESSAGE = """
+🤖 **Welcome to CurateX AI News Bot, {first_name}!**
+
+I'm your personal news curator powered by AI. Here's how it works:
+
+**� All inputs collected via Telegram:**
+• Use `/input` to start - I'll collect all your preferences
+• No external input needed - everything happens in this chat!
+
+**🔄 Complete Processing Pipeline:**
+1.  Collect your search query and preferences via `/input`
+2.  Pass query to `search.py` for article discovery  
+3.  Pass parameters to `llm.py` for AI curation
+4.  Deliver results back to you in Telegram
+5.  **Ask me questions about the news - I'll answer using AI!**
+
+**📋 Available Commands:**
+• `/input` - Start news curation (collects all inputs)
+• `/help` - Show detailed usage guide
+• `/cancel` - Cancel current operation
+
+** After receiving curated news:**
+• Just send me any question about the articles
+• I'll use AI-powered search to find answers from your curated content
+• Perfect for clarifications, deeper insights, or follow-up questions!
+"""
+
+# Sent once all articles are delivered; {status} is the sent-count line
+# (MarkdownV2, so the literal punctuation below is pre-escaped)
+COMPLETION_MESSAGE = (
+    "🎉 *All Done\\!*\n\n"
+    "{status}\n\n"
+    " *You can now ask me questions about the news\\!*\n"
+    "Just send me any question and I'll answer using the context of your curated articles\\.\n\n"
+    "*Examples:*\n"
+    "• What's the main trend in AI news?\n"
+    "• Tell me more about article 5\n"
+    "• Summarize the key points from all articles\n"
+    "• What are the most important developments?\n\n"
+    "Use `/input` for another curation request\\."
+)
+
+# Sent after each RAG answer
+FOLLOW_UP_MESSAGE = (
+    "❓ **Have more questions?** Just ask me anything about the news!\n\n"
+    "**You can ask about:**\n"
+    "• Specific articles (e.g., 'Tell me about article 5')\n"
+    "• General trends (e.g., 'What are the main themes?')\n"
+    "• Comparisons (e.g., 'Compare the different viewpoints')\n"
+    "• Summaries (e.g., 'Summarize the key points')\n\n"
+    "Or use `/input` to get new curated news."
+)
+
+def parse_delivery_time(time_str):
+    """Parse a 12-hour (e.g. '02:30 PM') or 24-hour (e.g. '14:30') time string to a time object"""
+    match = TIME_RE.match(time_str)
+    if not match:
+        return None
+    
+    hour, minute = int(match.group(1)), int(match.group(2))
+    meridiem = match.group(3)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem.upper() == 'PM' else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return dt_time(hour, minute)
+
+def escape_markdown_v2(text):
+    """Escape text so Telegram's MarkdownV2 parser shows it literally"""
+    return MARKDOWN_V2_SPECIAL_RE.sub(r'\\\1', text)
+
+def match_curated_fields(article_content):
+    """Pull title, link, source and the raw summary text out of a curated article"""
+    fields = {}
+    for name, pattern in (('title', CURATED_TITLE_RE), ('link', CURATED_URL_RE), ('source', CURATED_SOURCE_RE)):
+        match = pattern.search(article_content)
+        if match:
+            fields[name] = match.group(1).strip()
+    
+    # Prefer the NEWSPAPER3K summary, fall back to the LLM summary
+    for pattern in (CURATED_NEWSPAPER_SUMMARY_RE, CURATED_LLM_SUMMARY_RE):
+        match = pattern.search(article_content)
+        if match:
+            fields['summary'] = match.group(1)
+            break
+    return fields
+
+def clean_title(title):
+    """Strip list numbering and bold markers from an article title"""
+    return TITLE_CLEAN_RE.sub('', title.strip()).strip()
+
+@lru_cache(maxsize=1024)
+def link_to_source(link):
+    """Derive a source name from a link's domain (e.g. 'https://www.bbc.co.uk/x' -> 'Bbc')"""
+    try:
+        domain = urlparse(link).netloc.lower().replace('www.', '')
+    except ValueError:
+        return "Unknown Source"
+    return domain.split('.')[0].title() or "Unknown Source"
+
+def iter_sections(header_re, content):
+    """Yield (header match, text up to the next header) for every header_re match in content"""
+    headers = list(header_re.finditer(content))
+    for i, match in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(content)
+        yield match, content[match.end():end]
+
+def iter_split(content, sep):
+    """Lazily yield the pieces of content.split(sep) without building the list"""
+    start = 0
+    while (end := content.find(sep, start)) != -1:
+        yield content[start:end]
+        start = end + len(sep)
+    yield content[start:]
+
 class NewsCuratorBot:
     def __init__(self):
         self.bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
         if not self.bot_token:
             raise ValueError("TELEGRAM_BOT_TOKEN not found in environment variables")
         
+        # Telegram allows ~30 messages/second overall and ~1 message/second per chat
+        self._global_limiter = AsyncLimiter(28, 1)
+        self._chat_limiters = OrderedDict()
+        # Parsed articles keyed by (path, mtime, size) so unchanged files are parsed once
+        self._parse_articles_cached = lru_cache(maxsize=64)(self._parse_articles_file)
+        # Extracted article fields keyed by the article text, so re-parsing a file is free
+        self._curated_info_cached = lru_cache(maxsize=2048)(self._extract_curated_article_info)
+        
         # Verify that required modules are available
         self._verify_modules()
     
@@ -108,34 +305,8 @@ class NewsCuratorBot:
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command"""
         user = update.effective_user
-        welcome_message = f"""
-🤖 **Welcome to CurateX AI News Bot, {user.first_name}!**
-
-I'm your personal news curator powered by AI. Here's how it works:
-
-**� All inputs collected via Telegram:**
-• Use `/input` to start - I'll collect all your preferences
-• No external input needed - everything happens in this chat!
-
-**🔄 Complete Processing Pipeline:**
-1.  Collect your search query and preferences via `/input`
-2.  Pass query to `search.py` for article discovery  
-3.  Pass parameters to `llm.py` for AI curation
-4.  Deliver results back to you in Telegram
-5.  **Ask me questions about the news - I'll answer using AI!**
-
-**📋 Available Commands:**
-• `/input` - Start news curation (collects all inputs)
-• `/help` - Show detailed usage guide
-• `/cancel` - Cancel current operation
-
-** After receiving curated news:**
-• Just send me any question about the articles
-• I'll use AI-powered search to find answers from your curated content
-• Perfect for clarifications, deeper insights, or follow-up questions!
-
-**🚀 Ready to start?** Just type `/input` or say "hi"!
-        """
+        welcome_message = WELCOME_MESSAGE.format(first_name=user.first_name)
+        welcome_message += '\n**🚀 Ready to start?** Just type `/input` or say "hi"!\n'
         await update.message.reply_text(welcome_message, parse_mode='Markdown')
     
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -186,48 +357,24 @@ All user inputs are collected through this Telegram bot using `/input`
         """Handle greetings and general messages, including questions about news"""
         message_text = update.message.text.lower()
         user_id = update.effective_user.id
-        greetings = ['hi', 'hello', 'hey', 'start', 'begin']
         
         # Check if the message is a button click (contains command)
-        if any(cmd in update.message.text for cmd in ['/input', '/help', '/start']):
+        if COMMAND_RE.search(update.message.text):
             # Don't handle button clicks here - let the command handlers take care of them
             return
         
+        is_greeting = not GREETINGS.isdisjoint(WORD_RE.findall(message_text))
+        
         # If user has news context and this isn't a greeting, treat it as a question
-        if user_id in users_with_news_context and not any(greeting in message_text for greeting in greetings):
+        if user_id in users_with_news_context and not is_greeting:
             await self.handle_news_question(update, context)
             return
         
-        if any(greeting in message_text for greeting in greetings):
+        if is_greeting:
             user = update.effective_user
             
             # First, send the welcome message
-            welcome_message = f"""
-🤖 **Welcome to CurateX AI News Bot, {user.first_name}!**
-
-I'm your personal news curator powered by AI. Here's how it works:
-
-**� All inputs collected via Telegram:**
-• Use `/input` to start - I'll collect all your preferences
-• No external input needed - everything happens in this chat!
-
-**🔄 Complete Processing Pipeline:**
-1.  Collect your search query and preferences via `/input`
-2.  Pass query to `search.py` for article discovery  
-3.  Pass parameters to `llm.py` for AI curation
-4.  Deliver results back to you in Telegram
-5.  **Ask me questions about the news - I'll answer using AI!**
-
-**📋 Available Commands:**
-• `/input` - Start news curation (collects all inputs)
-• `/help` - Show detailed usage guide
-• `/cancel` - Cancel current operation
-
-** After receiving curated news:**
-• Just send me any question about the articles
-• I'll use AI-powered search to find answers from your curated content
-• Perfect for clarifications, deeper insights, or follow-up questions!
-            """
+            welcome_message = WELCOME_MESSAGE.format(first_name=user.first_name)
             
             await update.message.reply_text(welcome_message, parse_mode='Markdown')
             
@@ -269,8 +416,7 @@ I'm your personal news curator powered by AI. Here's how it works:
         user_id = update.effective_user.id
         
         # Clear any existing session data to start fresh
-        if user_id in user_sessions:
-            del user_sessions[user_id]
+        user_sessions.pop(user_id, None)
         
         user_sessions[user_id] = {}
         
@@ -394,19 +540,12 @@ I'm your personal news curator powered by AI. Here's how it works:
             return DELIVERY_TIME
         else:
             # Handle time input for scheduled delivery (accepts 12hr with AM/PM or 24hr)
-            time_obj = None
-            try:
-                # Try 12-hour format first
-                time_obj = datetime.strptime(choice, "%I:%M %p").time()
-            except ValueError:
-                try:
-                    # Fallback to 24-hour format
-                    time_obj = datetime.strptime(choice, "%H:%M").time()
-                except ValueError:
-                    await update.message.reply_text(
-                        "\u26a0\ufe0f Invalid time format. Please use HH:MM AM/PM (e.g., 02:30 PM) or 24-hour (e.g., 14:30)"
-                    )
-                    return DELIVERY_TIME
+            time_obj = parse_delivery_time(choice)
+            if time_obj is None:
+                await update.message.reply_text(
+                    "\u26a0\ufe0f Invalid time format. Please use HH:MM AM/PM (e.g., 02:30 PM) or 24-hour (e.g., 14:30)"
+                )
+                return DELIVERY_TIME
             user_sessions[user_id]['delivery_time'] = choice
         
         return await self.show_confirmation(update, context)
@@ -481,8 +620,7 @@ I'm your personal news curator powered by AI. Here's how it works:
             )
         
         # Clean up session
-        if user_id in user_sessions:
-            del user_sessions[user_id]
+        user_sessions.pop(user_id, None)
         
         return ConversationHandler.END
     
@@ -675,68 +813,77 @@ I'm your personal news curator powered by AI. Here's how it works:
                 parse_mode='Markdown'
             )
 
-            # Process each curated news file
-            total_articles_sent = 0
-            all_articles = []
-            
-            for file_path in files:
-                if os.path.exists(file_path) and file_path.endswith('.txt'):
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        
-                        # Parse individual news articles from the content
-                        articles = self.parse_news_articles(content)
-                        
-                        if articles:
-                            logger.info(f"Found {len(articles)} articles in {file_path}")
-                            all_articles.extend(articles)
-                        else:
-                            # If parsing fails, try to create articles from the raw content
-                            logger.warning(f"No articles parsed from {file_path}, trying raw content parsing")
-                            fallback_articles = self.create_fallback_articles(content)
-                            all_articles.extend(fallback_articles)
-                            
-                    except Exception as file_error:
-                        logger.error(f"Error reading file {file_path}: {file_error}")
-                        await update.message.reply_text(
-                            f" Error reading file: {os.path.basename(file_path)}",
-                            parse_mode=None
-                        )
+            # Parse files and send articles concurrently: the producer parses each
+            # file in a worker thread while a single sender drains the queue in order
+            # (the chat limiter allows one message a second, so more senders add nothing)
+            article_queue = asyncio.Queue(maxsize=32)
+            failed = []
 
-            # Send a status update
-            if all_articles:
-                await update.message.reply_text(
-                    f" **Found {len(all_articles)} articles to send**\n\n"
-                    "🚀 Sending each article as a separate message...",
-                    parse_mode='Markdown'
-                )
-                
-                # Send each article as a separate message
-                for i, article in enumerate(all_articles, 1):
+            async def produce_articles():
+                index = 0
+                try:
+                    for file_path in files:
+                        if not (os.path.exists(file_path) and file_path.endswith('.txt')):
+                            continue
+                        try:
+                            articles = await asyncio.to_thread(self.load_articles_from_file, file_path)
+                        except Exception as file_error:
+                            logger.error("Error reading file %s: %s", file_path, file_error)
+                            await self.reply_rate_limited(
+                                update,
+                                f" Error reading file: {os.path.basename(file_path)}",
+                                parse_mode=None
+                            )
+                            continue
+                        for article in articles:
+                            index += 1
+                            await article_queue.put((index, article))
+                finally:
+                    # Sentinel so the sender exits once the queue drains
+                    await article_queue.put(None)
+                return index
+
+            async def send_articles():
+                sent = 0
+                while True:
+                    item = await article_queue.get()
+                    if item is None:
+                        return sent
+                    i, article = item
                     try:
                         # Format the article message
                         message = self.format_article_message(article, i)
                         
-                        # Send the article message
-                        await update.message.reply_text(
+                        # Send the article message (paced by the rate limiters)
+                        await self.reply_rate_limited(
+                            update,
                             message,
                             parse_mode=None,
                             disable_web_page_preview=False  # Enable link previews
                         )
+                        sent += 1
                         
-                        # Add a small delay to avoid rate limiting
-                        await asyncio.sleep(0.8)
-                        
-                    except Exception as article_error:
-                        logger.error(f"Error sending article {i}: {article_error}")
-                        await update.message.reply_text(
-                            f" Error sending article {i}: {str(article_error)}",
-                            parse_mode=None
-                        )
-                
-                total_articles_sent = len(all_articles)
-            else:
+                    except Exception:
+                        # Report failures once at the end instead of spending a send on each
+                        logger.exception("Error sending article %s", i)
+                        failed.append(i)
+
+            total_articles_found, total_articles_sent = await asyncio.gather(
+                produce_articles(),
+                send_articles()
+            )
+            logger.info("Sent %s/%s articles", total_articles_sent, total_articles_found)
+
+            if failed:
+                shown = ', '.join(map(str, failed[:20]))
+                if len(failed) > 20:
+                    shown += ', ...'
+                await update.message.reply_text(
+                    f"⚠️ {len(failed)} articles failed to send: {shown}",
+                    parse_mode=None
+                )
+
+            if total_articles_found == 0:
                 await update.message.reply_text(
                     " No articles could be parsed from the curated files.\n"
                     "This might be due to an unexpected file format.",
@@ -747,26 +894,15 @@ I'm your personal news curator powered by AI. Here's how it works:
             await self.setup_rag_for_user(user_id, files)
 
             # Send completion message
-            completion_message = "🎉 **All Done!**\n\n"
             if total_articles_sent > 0:
-                completion_message += f" Successfully sent **{total_articles_sent}** individual news articles\n\n"
+                status = f" Successfully sent *{total_articles_sent}* individual news articles"
             else:
-                completion_message += "📎 Your curated news has been processed\n\n"
-            
-            completion_message += (
-                " **You can now ask me questions about the news!**\n"
-                "Just send me any question and I'll answer using the context of your curated articles.\n\n"
-                "**Examples:**\n"
-                "• What's the main trend in AI news?\n"
-                "• Tell me more about article 5\n"
-                "• Summarize the key points from all articles\n"
-                "• What are the most important developments?\n\n"
-                "Use `/input` for another curation request."
-            )
+                status = "📎 Your curated news has been processed"
+            completion_message = COMPLETION_MESSAGE.format(status=status)
             
             await update.message.reply_text(
                 completion_message,
-                parse_mode='Markdown'
+                parse_mode='MarkdownV2'
             )
 
         except Exception as e:
@@ -776,19 +912,68 @@ I'm your personal news curator powered by AI. Here's how it works:
                 parse_mode=None
             )
     
+    def chat_limiter(self, chat_id):
+        """Return the chat's rate limiter, evicting the least recently used beyond MAX_CHAT_LIMITERS"""
+        limiter = self._chat_limiters.get(chat_id)
+        if limiter is None:
+            limiter = self._chat_limiters[chat_id] = AsyncLimiter(1, 1.05)
+            if len(self._chat_limiters) > MAX_CHAT_LIMITERS:
+                self._chat_limiters.popitem(last=False)
+        else:
+            self._chat_limiters.move_to_end(chat_id)
+        return limiter
+    
+    async def reply_rate_limited(self, update, text, **kwargs):
+        """Reply within Telegram's global and per-chat rate limits, retrying after flood control"""
+        chat_limiter = self.chat_limiter(update.effective_chat.id)
+        for attempt in range(MAX_SEND_RETRIES + 1):
+            async with chat_limiter, self._global_limiter:
+                try:
+                    return await update.message.reply_text(text, **kwargs)
+                except RetryAfter as e:
+                    if attempt == MAX_SEND_RETRIES:
+                        raise
+                    retry_after = e.retry_after
+            
+            # Sleep outside the limiters so other chats are not held up
+            if isinstance(retry_after, timedelta):
+                retry_after = retry_after.total_seconds()
+            logger.warning("Flood control hit, retrying in %ss", retry_after)
+            await asyncio.sleep(retry_after)
+    
+    def load_articles_from_file(self, file_path):
+        """Read a curated news file and parse it into articles (runs in a worker thread)"""
+        stat = os.stat(file_path)
+        return self._parse_articles_cached(file_path, stat.st_mtime_ns, stat.st_size)
+    
+    def _parse_articles_file(self, file_path, mtime_ns, size):
+        """Parse a curated news file; mtime_ns and size only key the cache"""
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        
+        # Parse individual news articles from the content
+        articles = self.parse_news_articles(content)
+        if articles:
+            logger.info("Found %s articles in %s", len(articles), file_path)
+            return tuple(articles)
+        
+        # If parsing fails, try to create articles from the raw content
+        logger.warning("No articles parsed from %s, trying raw content parsing", file_path)
+        return tuple(self.create_fallback_articles(content))
+    
     def clean_markdown_content(self, content):
         """Clean content to avoid Markdown parsing issues"""
         try:
             # Remove all Markdown special characters to prevent parsing errors
             # This is safer than trying to balance them
-            content = re.sub(r'[*_`\[\](){}#~|\\]', '', content)
+            content = content.translate(MARKDOWN_STRIP_TABLE)
             
             # Remove excessive whitespace and newlines
-            content = re.sub(r'\n{3,}', '\n\n', content)
-            content = re.sub(r'[ \t]+', ' ', content)
+            content = EXTRA_NEWLINES_RE.sub('\n\n', content)
+            content = SPACES_RE.sub(' ', content)
             
             # Remove any remaining problematic characters
-            content = re.sub(r'[^\w\s\-.,!?:;"\'/\n]', '', content)
+            content = UNSAFE_CHARS_RE.sub('', content)
             
             # Clean up any remaining formatting issues
             content = content.strip()
@@ -798,7 +983,7 @@ I'm your personal news curator powered by AI. Here's how it works:
         except Exception as e:
             logger.error(f"Error cleaning markdown content: {e}")
             # If cleaning fails, return plain text without any special characters
-            return re.sub(r'[^\w\s\-.,!?:;"\'/\n]', '', str(content))
+            return UNSAFE_CHARS_RE.sub('', str(content))
     
     async def schedule_delivery(self, update, context, files, delivery_time):
         """Schedule delivery for later using curatex_bot functionality"""
@@ -810,7 +995,7 @@ I'm your personal news curator powered by AI. Here's how it works:
             
             if message_files:
                 # Copy the formatted message file to messages_to_user.txt for curatex_bot
-                shutil.copy(message_files[0], 'messages_to_user.txt')
+                await asyncio.to_thread(shutil.copy, message_files[0], 'messages_to_user.txt')
                 
                 # Setup RAG system for this user even with scheduled delivery
                 await self.setup_rag_for_user(user_id, files)
@@ -847,8 +1032,7 @@ I'm your personal news curator powered by AI. Here's how it works:
     async def cancel_conversation(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Cancel the current conversation"""
         user_id = update.effective_user.id
-        if user_id in user_sessions:
-            del user_sessions[user_id]
+        user_sessions.pop(user_id, None)
         
         # If it's a specific command, handle it appropriately
         if update.message.text.startswith('/start'):
@@ -867,14 +1051,13 @@ I'm your personal news curator powered by AI. Here's how it works:
         user_id = update.effective_user.id
         
         # Clean up existing session
-        if user_id in user_sessions:
-            del user_sessions[user_id]
+        user_sessions.pop(user_id, None)
         
         await update.message.reply_text(
-            "🔄 **Restarting Input Collection...**\n\n"
-            "Previous session cleared. Starting fresh!",
+            "🔄 *Restarting Input Collection\\.\\.\\.*\n\n"
+            "Previous session cleared\\. Starting fresh\\!",
             reply_markup=ReplyKeyboardRemove(),
-            parse_mode='Markdown'
+            parse_mode='MarkdownV2'
         )
         
         # End current conversation - the entry point will handle the new start
@@ -949,13 +1132,13 @@ I'm your personal news curator powered by AI. Here's how it works:
 
     def cleanup_temp_files(self):
         """Clean up temporary files created during the process"""
-        temp_files = ['data/news_results.txt', 'messages_to_user.txt']
-        for file in temp_files:
+        for file in TEMP_FILES:
             try:
-                if os.path.exists(file):
-                    os.remove(file)
-                    logger.info(f"Cleaned up {file}")
-            except Exception as e:
+                os.remove(file)
+                logger.info(f"Cleaned up {file}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
                 logger.error(f"Error cleaning up {file}: {e}")
 
     async def setup_rag_for_user(self, user_id, news_files):
@@ -963,29 +1146,20 @@ I'm your personal news curator powered by AI. Here's how it works:
         try:
             logger.info(f"Setting up RAG system for user {user_id}")
             
-            # Copy the curated news files to the data directory for RAG
-            import shutil
+            # The curated files and news_results.txt are already written to the
+            # data directory, which rag.setup_news_rag scans itself
             data_dir = "data"
-            
-            # Ensure data directory exists
             os.makedirs(data_dir, exist_ok=True)
             
-            # Files are already in data directory, no need to copy
-            logger.info(f"News files are already available in {data_dir}")
-            
-            # news_results.txt is already in data folder, no need to copy
-            if os.path.exists('data/news_results.txt'):
-                logger.info("news_results.txt already available in data directory")
-            
             # Setup the RAG system with the news files
             try:
                 import rag  # Import RAG module only when files are available
-                loop = asyncio.get_event_loop()
-                rag_setup_success = await loop.run_in_executor(None, rag.setup_news_rag, data_dir)
+                rag_setup_success = await asyncio.to_thread(rag.setup_news_rag, data_dir)
                 
                 if rag_setup_success:
-                    # Add user to the set of users who can ask questions
+                    # Add user to the set of users who can ask questions, starting a fresh conversation
                     users_with_news_context.add(user_id)
+                    rag.reset_conversation(user_id)
                     logger.info(f" RAG system setup successful for user {user_id}")
                 else:
                     logger.warning(f" RAG system setup failed for user {user_id}")
@@ -1018,36 +1192,28 @@ I'm your personal news curator powered by AI. Here's how it works:
             )
             
             # Use RAG system to answer the question
-            loop = asyncio.get_event_loop()
-            answer = await loop.run_in_executor(None, self._answer_question_sync, question)
+            answer = await self._answer_question(question, user_id)
             
             if answer and answer.strip():
-                # Split long answers into chunks
-                max_length = 4000
+                # Split long answers into chunks; escaping can at most double a
+                # chunk, which keeps every part under Telegram's 4096 limit
+                max_length = 2000
                 if len(answer) > max_length:
                     chunks = [answer[i:i+max_length] for i in range(0, len(answer), max_length)]
+                    # One part at a time, so the parts arrive in order
                     for i, chunk in enumerate(chunks):
-                        await update.message.reply_text(
-                            f" **Answer (Part {i+1}/{len(chunks)}):**\n\n{chunk}",
-                            parse_mode='Markdown'
+                        await self.reply_rate_limited(
+                            update,
+                            f" *Answer \\(Part {i+1}/{len(chunks)}\\):*\n\n{escape_markdown_v2(chunk)}",
+                            parse_mode='MarkdownV2'
                         )
-                        await asyncio.sleep(1)
                 else:
                     await update.message.reply_text(
-                        f" **Answer:**\n\n{answer}",
-                        parse_mode='Markdown'
+                        f" *Answer:*\n\n{escape_markdown_v2(answer)}",
+                        parse_mode='MarkdownV2'
                     )
                     
-                await update.message.reply_text(
-                    "❓ **Have more questions?** Just ask me anything about the news!\n\n"
-                    "**You can ask about:**\n"
-                    "• Specific articles (e.g., 'Tell me about article 5')\n"
-                    "• General trends (e.g., 'What are the main themes?')\n"
-                    "• Comparisons (e.g., 'Compare the different viewpoints')\n"
-                    "• Summaries (e.g., 'Summarize the key points')\n\n"
-                    "Or use `/input` to get new curated news.",
-                    parse_mode='Markdown'
-                )
+                await update.message.reply_text(FOLLOW_UP_MESSAGE, parse_mode='Markdown')
             else:
                 await update.message.reply_text(
                     " Sorry, I couldn't find a relevant answer to your question in the curated news.\n\n"
@@ -1067,25 +1233,19 @@ I'm your personal news curator powered by AI. Here's how it works:
                 parse_mode='Markdown'
             )
     
-    def _answer_question_sync(self, question):
-        """Synchronous wrapper for RAG question answering"""
+    async def _answer_question(self, question, user_id):
+        """Answer a question with the RAG module on the running event loop"""
         try:
             # Import RAG module only when needed
             import rag
-            
-            # Use the async function from rag module
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                answer = loop.run_until_complete(rag.answer_news_question(question))
-                return answer
-            finally:
-                loop.close()
         except ImportError as e:
             logger.error(f"RAG module not available: {e}")
             return "Sorry, the question-answering system is not available. Please ensure news has been curated first."
+        
+        try:
+            return await rag.answer_news_question(question, user_id)
         except Exception as e:
-            logger.error(f"Error in sync question answering: {e}")
+            logger.error(f"Error in question answering: {e}")
             return None
 
     def parse_news_articles(self, content):
@@ -1093,60 +1253,51 @@ I'm your personal news curator powered by AI. Here's how it works:
         try:
             articles = []
             
-            # Debug the content structure
-            self.debug_content_structure(content)
+            # Debug the content structure (skip the extra regex passes unless debugging)
+            if logger.isEnabledFor(logging.DEBUG):
+                self.debug_content_structure(content)
             
             # Strategy 1: Parse articles with "📰 ARTICLE X" format (main strategy for curated_news_X_articles.txt)
-            article_pattern = r'📰 ARTICLE (\d+)\n=+\n(.*?)(?=📰 ARTICLE \d+|$)'
-            article_matches = re.findall(article_pattern, content, re.DOTALL)
+            # Only the headers are matched; each article is the slice up to the next header
+            article_sections = list(iter_sections(ARTICLE_HEAD_RE, content))
             
-            if article_matches:
-                logger.info(f"Found {len(article_matches)} articles in curated format")
-                for match in article_matches:
-                    article_num, article_content = match
+            if article_sections:
+                logger.info("Found %s articles in curated format", len(article_sections))
+                for match, article_content in article_sections:
                     article = self.extract_curated_article_info(article_content.strip())
                     if article:
                         articles.append(article)
             
             # Strategy 2: Look for numbered articles (1., 2., etc.) - fallback
             if not articles:
-                numbered_pattern = r'(\d+)\.\s*([^\n]+)\n(.*?)(?=\n\d+\.\s*[^\n]+|\Z)'
-                numbered_matches = re.findall(numbered_pattern, content, re.DOTALL)
+                numbered_sections = list(iter_sections(NUMBERED_HEAD_RE, content))
                 
-                if numbered_matches:
-                    logger.info(f"Found {len(numbered_matches)} numbered articles")
-                    for match in numbered_matches:
-                        number, title, body = match
-                        article = self.extract_article_info(title, body)
+                if numbered_sections:
+                    logger.info("Found %s numbered articles", len(numbered_sections))
+                    for match, body in numbered_sections:
+                        article = self.extract_article_info(clean_title(match.group(2)), body)
                         if article:
                             articles.append(article)
             
             # Strategy 3: Look for title patterns (Title:, **Title**, etc.) - fallback
             if not articles:
-                title_patterns = [
-                    r'(?:Title:|**.*?**|###.*?)\s*([^\n]+)\n(.*?)(?=(?:Title:|**.*?**|###.*?)|\Z)',
-                    r'([A-Z][^\n]{20,})\n(.*?)(?=\n[A-Z][^\n]{20,}|\Z)'
-                ]
-                
-                for pattern in title_patterns:
-                    matches = re.findall(pattern, content, re.DOTALL)
+                for pattern in TITLE_PATTERN_RES:
+                    matches = pattern.findall(content)
                     if matches:
-                        logger.info(f"Found {len(matches)} title pattern matches")
+                        logger.info("Found %s title pattern matches", len(matches))
                         for match in matches:
                             title, body = match
-                            article = self.extract_article_info(title, body)
+                            article = self.extract_article_info(clean_title(title), body)
                             if article:
                                 articles.append(article)
                         break
             
             # Strategy 4: Split by common separators and try to extract articles - fallback
             if not articles:
-                separators = ['\n---\n', '\n===\n', '\n***\n', '\n\n\n']
-                for separator in separators:
+                for separator in ARTICLE_SEPARATORS:
                     if separator in content:
-                        chunks = content.split(separator)
-                        logger.info(f"Split by {separator}, got {len(chunks)} chunks")
-                        for chunk in chunks:
+                        logger.info("Splitting by %r", separator)
+                        for chunk in iter_split(content, separator):
                             if len(chunk.strip()) > 50:  # Minimum content length
                                 article = self.extract_article_info_from_chunk(chunk)
                                 if article:
@@ -1156,70 +1307,42 @@ I'm your personal news curator powered by AI. Here's how it works:
             
             # Strategy 5: If still no articles, try to split by double newlines - fallback
             if not articles:
-                chunks = content.split('\n\n')
-                logger.info(f"Split by double newlines, got {len(chunks)} chunks")
-                for chunk in chunks:
+                logger.info("Splitting by double newlines")
+                for chunk in iter_split(content, '\n\n'):
                     if len(chunk.strip()) > 100:  # Minimum content length for chunk
                         article = self.extract_article_info_from_chunk(chunk)
                         if article:
                             articles.append(article)
             
-            logger.info(f"Successfully parsed {len(articles)} articles from content")
+            logger.info("Successfully parsed %s articles from content", len(articles))
             return articles
             
         except Exception as e:
-            logger.error(f"Error parsing articles: {e}")
+            logger.error("Error parsing articles: %s", e)
             return []
 
     def extract_article_info(self, title, body):
-        """Extract article information from title and body text"""
+        """Extract article information from a cleaned title and body text"""
         try:
-            # Clean the title
-            title = re.sub(r'^\d+\.\s*', '', title.strip())
-            title = re.sub(r'\*\*', '', title)
-            title = title.strip()
-            
             # Extract link (look for URLs)
-            link_pattern = r'https?://[^\s\n)]+|www\.[^\s\n)]+|[^\s\n]+\.[a-z]{2,}[^\s\n]*'
-            links = re.findall(link_pattern, body, re.IGNORECASE)
+            links = LINK_RE.findall(body)
             link = links[0] if links else "No link available"
             
             # Extract source (look for common source indicators)
-            source_patterns = [
-                r'Source:\s*([^\n]+)',
-                r'From:\s*([^\n]+)',
-                r'Via:\s*([^\n]+)',
-                r'Published by:\s*([^\n]+)',
-                r'- ([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)',  # Common news source names
-                r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:\s+News|\s+Times|\s+Post|\s+Herald|\s+Tribune|\s+Journal|\s+Today|\s+CNN|\s+BBC|\s+Reuters|\s+AP|\s+Bloomberg))',
-            ]
-            
             source = "Unknown Source"
-            for pattern in source_patterns:
-                source_match = re.search(pattern, body, re.IGNORECASE)
+            for pattern in SOURCE_RES:
+                source_match = pattern.search(body)
                 if source_match:
                     source = source_match.group(1).strip()
                     break
             
             # If no source found, try to extract from link domain
             if source == "Unknown Source" and link != "No link available":
-                try:
-                    from urllib.parse import urlparse
-                    parsed_url = urlparse(link)
-                    domain = parsed_url.netloc.lower()
-                    # Clean domain name
-                    domain = domain.replace('www.', '')
-                    source = domain.split('.')[0].title()
-                except:
-                    pass
+                source = link_to_source(link)
             
             # Extract summary (first few sentences or paragraph)
-            summary_text = re.sub(r'https?://[^\s\n]+', '', body)  # Remove URLs
-            summary_text = re.sub(r'Source:.*?(?=\n|$)', '', summary_text, flags=re.IGNORECASE)
-            summary_text = re.sub(r'From:.*?(?=\n|$)', '', summary_text, flags=re.IGNORECASE)
-            summary_text = re.sub(r'Via:.*?(?=\n|$)', '', summary_text, flags=re.IGNORECASE)
-            summary_text = re.sub(r'Published by:.*?(?=\n|$)', '', summary_text, flags=re.IGNORECASE)
-            summary_text = re.sub(r'\s+', ' ', summary_text).strip()
+            summary_text = SUMMARY_STRIP_RE.sub('', body)  # Remove URLs and source lines
+            summary_text = WHITESPACE_RE.sub(' ', summary_text).strip()
             
             # Take first 400 characters as summary
             if len(summary_text) > 400:
@@ -1235,45 +1358,36 @@ I'm your personal news curator powered by AI. Here's how it works:
             }
             
         except Exception as e:
-            logger.error(f"Error extracting article info: {e}")
+            logger.error("Error extracting article info: %s", e)
             return None
 
     def extract_article_info_from_chunk(self, chunk):
         """Extract article info from a content chunk"""
         try:
-            lines = chunk.strip().split('\n')
-            if len(lines) < 2:
+            # First line is likely the title, the rest is the body
+            title, newline, body = chunk.strip().partition('\n')
+            if not newline:
                 return None
             
-            # First line is likely the title
-            title = lines[0].strip()
-            
-            # Remove common prefixes
-            title = re.sub(r'^\d+\.\s*', '', title)
-            title = re.sub(r'\*\*', '', title)
-            
-            # Rest is the body
-            body = '\n'.join(lines[1:])
-            
-            return self.extract_article_info(title, body)
+            return self.extract_article_info(clean_title(title), body)
             
         except Exception as e:
-            logger.error(f"Error extracting from chunk: {e}")
+            logger.error("Error extracting from chunk: %s", e)
             return None
 
     def format_article_message(self, article, index):
         """Format a single article into the required message format"""
         try:
-            message = f"Article {index}:\n\n"
-            message += f"{article['title']}\n\n"
-            message += f"{article['summary']}\n\n"
-            message += f"{article['link']}\n\n"
-            message += f"{article['source']}"
-            
-            return message
+            return '\n\n'.join((
+                f"Article {index}:",
+                article['title'],
+                article['summary'],
+                article['link'],
+                article['source'],
+            ))
             
         except Exception as e:
-            logger.error(f"Error formatting article message: {e}")
+            logger.error("Error formatting article message: %s", e)
             return f"Article {index}:\n\nError formatting article content"
 
     async def send_file_as_chunks(self, update, file_path, content):
@@ -1286,12 +1400,14 @@ I'm your personal news curator powered by AI. Here's how it works:
             max_length = 3000
             chunks = [safe_content[i:i+max_length] for i in range(0, len(safe_content), max_length)]
             
+            # One part at a time through the rate limiter, so the parts arrive in order
+            file_name = os.path.basename(file_path)
             for i, chunk in enumerate(chunks):
-                await update.message.reply_text(
-                    f"📰 {os.path.basename(file_path)} (Part {i+1}/{len(chunks)})\n\n{chunk}",
+                await self.reply_rate_limited(
+                    update,
+                    f"📰 {file_name} (Part {i+1}/{len(chunks)})\n\n{chunk}",
                     parse_mode=None
                 )
-                await asyncio.sleep(1)
                 
         except Exception as e:
             logger.error(f"Error sending file as chunks: {e}")
@@ -1301,103 +1417,78 @@ I'm your personal news curator powered by AI. Here's how it works:
         try:
             articles = []
             
-            # Split content into chunks and try to create articles
-            chunks = content.split('\n\n')
+            # Walk the chunks lazily so large inputs stop after the article cap
             current_article = []
             
-            for chunk in chunks:
+            for chunk in iter_split(content, '\n\n'):
                 chunk = chunk.strip()
-                if len(chunk) > 20:  # Minimum chunk length
-                    current_article.append(chunk)
+                if len(chunk) <= 20:  # Minimum chunk length
+                    continue
+                current_article.append(chunk)
+                
+                # If we have enough content, try to create an article
+                if len(current_article) >= 2:
+                    title = current_article[0][:100]  # First 100 chars as title
+                    body = '\n'.join(current_article[1:])
                     
-                    # If we have enough content, try to create an article
-                    if len(current_article) >= 2:
-                        title = current_article[0][:100]  # First 100 chars as title
-                        body = '\n'.join(current_article[1:])
-                        
-                        article = {
-                            'title': title,
-                            'summary': body[:400] + "..." if len(body) > 400 else body,
-                            'link': "Check source files for links",
-                            'source': "Curated News"
-                        }
-                        
-                        articles.append(article)
-                        current_article = []
-                        
-                        # Limit to reasonable number of articles
-                        if len(articles) >= 30:
-                            break
+                    article = {
+                        'title': title,
+                        'summary': body[:400] + "..." if len(body) > 400 else body,
+                        'link': "Check source files for links",
+                        'source': "Curated News"
+                    }
+                    
+                    articles.append(article)
+                    current_article = []
+                    
+                    # Limit to reasonable number of articles
+                    if len(articles) >= 30:
+                        break
             
-            logger.info(f"Created {len(articles)} fallback articles")
+            logger.info("Created %s fallback articles", len(articles))
             return articles
             
         except Exception as e:
-            logger.error(f"Error creating fallback articles: {e}")
+            logger.error("Error creating fallback articles: %s", e)
             return []
     
     def debug_content_structure(self, content):
         """Debug helper to understand the structure of curated content"""
         try:
-            logger.info("=== CONTENT STRUCTURE DEBUG ===")
-            logger.info(f"Content length: {len(content)}")
-            logger.info(f"First 500 chars: {content[:500]}")
-            logger.info(f"Number of lines: {len(content.split('\n'))}")
+            logger.debug("=== CONTENT STRUCTURE DEBUG ===")
+            logger.debug("Content length: %s", len(content))
+            logger.debug("First 500 chars: %s", content[:500])
+            logger.debug("Number of lines: %s", content.count(chr(10)) + 1)
             
             # Check for common patterns
-            patterns = {
-                'curated_articles': r'📰 ARTICLE \d+',
-                'numbered_articles': r'\d+\.\s*[^\n]+',
-                'title_patterns': r'📰 TITLE:\s*[^\n]+',
-                'url_patterns': r'🔗 URL:\s*[^\n]+',
-                'source_patterns': r'📰 SOURCE:\s*[^\n]+',
-                'bold_titles': r'\*\*[^\*]+\*\*',
-                'urls': r'https?://[^\s\n]+',
-                'separators': r'---+|===+|\*\*\*+'
-            }
-            
-            for pattern_name, pattern in patterns.items():
-                matches = re.findall(pattern, content)
-                logger.info(f"{pattern_name}: {len(matches)} matches")
+            for pattern_name, pattern in DEBUG_PATTERNS.items():
+                matches = pattern.findall(content)
+                logger.debug("%s: %s matches", pattern_name, len(matches))
                 if matches:
-                    logger.info(f"  First match: {matches[0][:100]}")
+                    logger.debug("  First match: %s", matches[0][:100])
                     
-            logger.info("=== END DEBUG ===")
+            logger.debug("=== END DEBUG ===")
             
         except Exception as e:
-            logger.error(f"Debug error: {e}")
+            logger.error("Debug error: %s", e)
 
     def extract_curated_article_info(self, article_content):
+        """Extract article information from curated news format (memoized per article text)"""
+        article = self._curated_info_cached(article_content)
+        # Hand out a copy so callers cannot modify the cached entry
+        return dict(article) if article else article
+
+    def _extract_curated_article_info(self, article_content):
         """Extract article information from curated news format"""
         try:
-            # Extract title
-            title_match = re.search(r'📰 TITLE:\s*([^\n]+)', article_content)
-            title = title_match.group(1).strip() if title_match else "No title available"
+            fields = match_curated_fields(article_content)
+            title = fields.get('title', "No title available")
+            link = fields.get('link', "No link available")
+            source = fields.get('source', "Unknown Source")
             
-            # Extract URL/Link
-            url_match = re.search(r'🔗 URL:\s*([^\n]+)', article_content)
-            link = url_match.group(1).strip() if url_match else "No link available"
-            
-            # Extract source
-            source_match = re.search(r'📰 SOURCE:\s*([^\n]+)', article_content)
-            source = source_match.group(1).strip() if source_match else "Unknown Source"
-            
-            # Extract summary - prefer NEWSPAPER3K SUMMARY, fallback to LLM SUMMARY
-            newspaper_summary_match = re.search(r'📄 NEWSPAPER3K SUMMARY:\n-+\n(.*?)(?=🎯 WHY THIS ARTICLE|$)', article_content, re.DOTALL)
-            llm_summary_match = re.search(r'📋 LLM SUMMARY:\n-+\n(.*?)(?=📄 NEWSPAPER3K SUMMARY|🎯 WHY THIS ARTICLE|$)', article_content, re.DOTALL)
-            
-            summary = ""
-            if newspaper_summary_match:
-                summary = newspaper_summary_match.group(1).strip()
-            elif llm_summary_match:
-                summary = llm_summary_match.group(1).strip()
-            
-            # Clean up summary
+            # Clean up summary, collapsing whitespace and newlines
+            summary = ' '.join(fields.get('summary', '').split())
             if summary:
-                # Remove excessive whitespace and newlines
-                summary = re.sub(r'\n+', ' ', summary)
-                summary = re.sub(r'\s+', ' ', summary).strip()
-                
                 # Limit summary length
                 if len(summary) > 500:
                     summary = summary[:500] + "..."
@@ -1411,9 +1502,10 @@ I'm your personal news curator powered by AI. Here's how it works:
                 meaningful_lines = []
                 for line in content_lines:
                     line = line.strip()
+                    # Skip labelled lines and "=====" rules
                     if (len(line) > 30 and 
-                        not line.startswith(('📰', '🔗', '📄', '📋', '🎯', '🏆', '📅', '-')) and
-                        not re.match(r'^=+$', line)):
+                        line[0] not in SUMMARY_SKIP_CHARS and
+                        line.strip('=')):
                         meaningful_lines.append(line)
                 
                 if meaningful_lines:
@@ -1429,7 +1521,7 @@ I'm your personal news curator powered by AI. Here's how it works:
             }
             
         except Exception as e:
-            logger.error(f"Error extracting curated article info: {e}")
+            logger.error("Error extracting curated article info: %s", e)
             return None
 
     def test_curated_parsing(self, file_path):
@@ -12,9 +12,19 @@ from llama_index.core.retrievers import BaseRetriever
 from llama_index.llms.groq import Groq
 from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.core.node_parser import SimpleNodeParser
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.core.schema import NodeWithScore
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import asyncio
+import hashlib
+import json
 import os
 import re
+import threading
+import time
+import numpy as np
+import torch
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,11 +33,42 @@ load_dotenv()
 if not os.getenv("GROQ_API_KEY"):
     raise ValueError("GROQ_API_KEY environment variable is required")
 
+# Number of recent query/text embeddings kept in memory
+EMBED_CACHE_SIZE = 4096
+
+class CachedHuggingFaceEmbedding(HuggingFaceEmbedding):
+    """HuggingFaceEmbedding with an in-memory LRU so repeated texts and queries skip the model"""
+    _cache: OrderedDict = PrivateAttr(default_factory=OrderedDict)
+    _cache_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def _embed(self, inputs, prompt_name=None):
+        # Keys hash the text (and query/text prompt) so large chunks aren't kept alive
+        keys = [(prompt_name, hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()) for text in inputs]
+        found = {}
+        with self._cache_lock:
+            for key in keys:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    found[key] = self._cache[key]
+        
+        # Embed each missing text once, even if it repeats within the batch
+        missing = {key: text for key, text in zip(keys, inputs) if key not in found}
+        if missing:
+            embeddings = super()._embed(list(missing.values()), prompt_name=prompt_name)
+            with self._cache_lock:
+                for key, embedding in zip(missing, embeddings):
+                    found[key] = self._cache[key] = np.asarray(embedding, dtype=np.float32)
+                while len(self._cache) > EMBED_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return [found[key].tolist() for key in keys]
+
 # Settings control global defaults
-Settings.embed_model = HuggingFaceEmbedding(
+Settings.embed_model = CachedHuggingFaceEmbedding(
     model_name="intfloat/e5-large-v2", 
     cache_folder="./cache",
-    device="cuda"  # Use CUDA for GPU acceleration
+    device="cuda",  # Use CUDA for GPU acceleration
+    embed_batch_size=128,  # Fill the GPU when indexing many chunks at once
+    model_kwargs={"torch_dtype": torch.float16},  # Half-precision weights use the tensor cores
 )
 Settings.llm = Groq(
     model="llama-3.1-8b-instant",
@@ -35,150 +76,348 @@ Settings.llm = Groq(
     request_timeout=360.0,
 )
 
+# Persisted indexes, plus a manifest of which files (and versions) they contain
+STORAGE_DIR = "storage"
+MANIFEST_PATH = os.path.join(STORAGE_DIR, "manifest.json")
+BM25_DIR = os.path.join(STORAGE_DIR, "bm25")
+
 # Global variables for indexes - will be initialized when setup_news_rag is called
+storage_context = None
 vector_index = None
 keyword_index = None
 hybrid_query_engine = None
 nodes = None
-conversation_history = []
+indexed_files = {}
+
+# Conversation history per user (None for the command-line loop), reset when
+# the user receives a new news delivery
+conversation_histories = {}
+
+# setup_news_rag mutates the shared indexes, docstore, manifest and BM25 dir; one run at a time
+setup_lock = threading.Lock()
+
+# Semantic answer cache: a standalone question whose embedding is this close (cosine)
+# to a recent one, and which names the same entities, reuses its answer instead of
+# running retrieval and the LLM again. e5 similarities sit in a compressed high
+# range, so the cutoff is strict and the entity check catches "Apple" vs "Google"
+SEMANTIC_CACHE_THRESHOLD = 0.98
+SEMANTIC_CACHE_TTL = 300  # seconds
+SEMANTIC_CACHE_SIZE = 1000
+QUERY_WORD_RE = re.compile(r"[\w'&.-]+")
+
+def query_entities(query):
+    """Lower-cased capitalized words (past the first word) and numbers in a question"""
+    words = QUERY_WORD_RE.findall(query)
+    return frozenset(
+        word.lower() for i, word in enumerate(words)
+        if word[0].isdigit() or (i and word[0].isupper())
+    )
+
+class SemanticCache:
+    """Fixed-size cache of (normalized query embedding, answer), oldest entries evicted first"""
+    def __init__(self, threshold, ttl, max_entries):
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clear()
+
+    def clear(self):
+        self._embeddings = None
+        self._added_at = np.full(self.max_entries, -np.inf)
+        self._answers = [None] * self.max_entries
+        self._entities = [None] * self.max_entries
+        self._next = 0
+
+    def lookup(self, embedding, entities):
+        """Return the cached answer for the most similar live entry above the threshold
+        that names the same entities, if any"""
+        if self._embeddings is None:
+            return None
+        query = np.asarray(embedding, dtype=np.float32)
+        sims = self._embeddings @ (query / np.linalg.norm(query))
+        sims[self._added_at < time.monotonic() - self.ttl] = -np.inf
+        best = int(np.argmax(sims))
+        if sims[best] < self.threshold or self._entities[best] != entities:
+            return None
+        return self._answers[best]
+
+    def add(self, embedding, entities, answer):
+        vector = np.asarray(embedding, dtype=np.float32)
+        if self._embeddings is None:
+            self._embeddings = np.zeros((self.max_entries, vector.size), dtype=np.float32)
+        slot = self._next % self.max_entries
+        self._embeddings[slot] = vector / np.linalg.norm(vector)
+        self._added_at[slot] = time.monotonic()
+        self._answers[slot] = answer
+        self._entities[slot] = entities
+        self._next += 1
+
+answer_cache = SemanticCache(SEMANTIC_CACHE_THRESHOLD, SEMANTIC_CACHE_TTL, SEMANTIC_CACHE_SIZE)
+
+# Exact cache: answers to standalone questions keyed by the question text,
+# checked before anything is embedded
+PROMPT_CACHE_SIZE = 256
+prompt_cache = OrderedDict()
+
+# Number of merged results handed to the query engine
+HYBRID_TOP_K = 5
+# Reciprocal rank fusion constant; damps the gap between a retriever's first and later hits
+RRF_K = 60
 
 # Define a custom hybrid retriever class
 class HybridRetriever(BaseRetriever):
     def __init__(self, retrievers):
         self._retrievers = retrievers
+        # The retrievers are independent, so they run side by side
+        self._pool = ThreadPoolExecutor(max_workers=len(retrievers))
         super().__init__()
 
+    @staticmethod
+    def _safe_retrieve(retriever, query_bundle):
+        try:
+            return retriever.retrieve(query_bundle)
+        except Exception as e:
+            print(f"Warning: Retriever failed: {e}")
+            return []
+
     def _retrieve(self, query_bundle):
-        # Retrieve results from each retriever
-        all_results = []
-        for retriever in self._retrievers:
-            try:
-                results = retriever.retrieve(query_bundle)
-                all_results.extend(results)
-            except Exception as e:
-                print(f"Warning: Retriever failed: {e}")
-                continue
-
-        # Create a dictionary to store unique nodes and their highest scores
-        unique_nodes = {}
-        for res in all_results:
-            node_id = res.node.node_id
-            if node_id not in unique_nodes:
-                unique_nodes[node_id] = res
-            else:
-                # If node already exists, update with the higher score
-                if hasattr(res, 'score') and hasattr(unique_nodes[node_id], 'score'):
-                    if res.score and (not unique_nodes[node_id].score or res.score > unique_nodes[node_id].score):
-                        unique_nodes[node_id] = res
+        # Retrieve results from each retriever concurrently
+        futures = [self._pool.submit(self._safe_retrieve, retriever, query_bundle) for retriever in self._retrievers]
+        return self._merge_results([future.result() for future in futures])
+
+    async def _aretrieve(self, query_bundle):
+        # Most retrievers here are synchronous, so fan out to threads instead of
+        # running them one after another on the event loop
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(self._pool, self._safe_retrieve, retriever, query_bundle)
+            for retriever in self._retrievers
+        ))
+        return self._merge_results(results)
+
+    @staticmethod
+    def _merge_results(results_per_retriever):
+        # Reciprocal rank fusion: every retriever adds 1 / (RRF_K + rank) for each node it
+        # returns, so cosine, BM25 and the unscored keyword-table hits all count alike
+        fused = {}
+        for results in results_per_retriever:
+            for rank, res in enumerate(results, 1):
+                node_id = res.node.node_id
+                if node_id in fused:
+                    fused[node_id].score += 1.0 / (RRF_K + rank)
+                else:
+                    fused[node_id] = NodeWithScore(node=res.node, score=1.0 / (RRF_K + rank))
         
-        # Return the unique nodes as a list
-        return list(unique_nodes.values())
+        # Return the best HYBRID_TOP_K unique nodes; the sort is stable, so ties keep first-seen order
+        return sorted(fused.values(), key=lambda res: res.score, reverse=True)[:HYBRID_TOP_K]
 
-def setup_news_rag(data_dir="data"):
-    """Setup RAG system with news files from the specified directory"""
-    global vector_index, keyword_index, hybrid_query_engine, nodes
-    
+def load_manifest():
+    """Load the {file path: fingerprint and doc ids} manifest of indexed files"""
     try:
-        # Check if data directory exists and has files
-        if not os.path.exists(data_dir):
-            print(f"Data directory {data_dir} does not exist")
-            return False
-            
-        # Get list of files in data directory
-        files = [f for f in os.listdir(data_dir) if f.endswith('.txt')]
-        if not files:
-            print(f"No .txt files found in {data_dir}")
-            return False
-            
-        print(f"Setting up RAG with {len(files)} files from {data_dir}")
-        
-        # Try to load existing storage, otherwise create new indexes
-        storage_dir = "storage"
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def load_or_create_indexes():
+    """Return (storage context, vector index, keyword index, manifest) loaded from storage, or empty ones"""
+    manifest = load_manifest()
+    if manifest:
         try:
             print("Trying to load existing indexes from storage...")
-            storage_context = StorageContext.from_defaults(persist_dir=storage_dir)
-            vector_index = load_index_from_storage(storage_context, index_id="vector")
-            keyword_index = load_index_from_storage(storage_context, index_id="keyword")
+            storage = StorageContext.from_defaults(persist_dir=STORAGE_DIR)
+            vector = load_index_from_storage(storage, index_id="vector")
+            keyword = load_index_from_storage(storage, index_id="keyword")
             print("Loaded existing indexes from storage.")
-            
-            # Still need to load documents for BM25 (not stored)
-            documents = SimpleDirectoryReader(data_dir).load_data()
-            parser = SimpleNodeParser.from_defaults(
-                chunk_size=1000,
-                chunk_overlap=200,
-            )
-            nodes = parser.get_nodes_from_documents(documents)
-            
+            return storage, vector, keyword, manifest
         except Exception as e:
             print(f"Could not load from storage ({e}), creating new indexes...")
-            
-            print("Loading documents...")
+    
+    # Both indexes share one storage context so a single persist keeps both
+    storage = StorageContext.from_defaults()
+    vector = VectorStoreIndex([], storage_context=storage, embed_model=Settings.embed_model)
+    keyword = SimpleKeywordTableIndex([], storage_context=storage)
+    vector.set_index_id("vector")
+    keyword.set_index_id("keyword")
+    return storage, vector, keyword, {}
+
+def load_or_build_bm25(nodes, rebuild):
+    """Load the persisted BM25 retriever, or tokenize the nodes and persist a new one"""
+    if not rebuild:
+        try:
+            bm25_retriever = BM25Retriever.from_persist_dir(BM25_DIR)
+            # Guard against a BM25 index left over from an interrupted update
+            if len(bm25_retriever.corpus) == len(nodes):
+                return bm25_retriever
+            print("Persisted BM25 index is out of date, rebuilding...")
+        except Exception as e:
+            print(f"Could not load BM25 index ({e}), rebuilding...")
+    
+    bm25_retriever = BM25Retriever.from_defaults(nodes=nodes, similarity_top_k=3)
+    bm25_retriever.persist(BM25_DIR)
+    return bm25_retriever
+
+def setup_news_rag(data_dir="data"):
+    """Setup RAG system with news files from the specified directory.
+
+    Only files whose (mtime, size) changed since the last run are parsed and
+    embedded; nodes of changed or deleted files are removed from the indexes.
+    The update is made on a fresh copy of the persisted indexes and swapped in
+    at the end, so questions being answered never see a half-updated store.
+    """
+    global storage_context, vector_index, keyword_index, hybrid_query_engine, nodes, indexed_files
+    
+    with setup_lock:
+        try:
+            # Fingerprint the .txt files with a single directory scan
             try:
-                documents = SimpleDirectoryReader(data_dir).load_data()
-                print(f"Loaded {len(documents)} documents.")
-            except Exception as e:
-                print(f"Error loading documents: {e}")
+                current = {}
+                with os.scandir(data_dir) as entries:
+                    for entry in entries:
+                        if entry.name.endswith('.txt') and entry.is_file():
+                            stat = entry.stat()
+                            current[entry.path] = [stat.st_mtime_ns, stat.st_size]
+            except FileNotFoundError:
+                print(f"Data directory {data_dir} does not exist")
+                return False
+            
+            if not current:
+                print(f"No .txt files found in {data_dir}")
+                return False
+            
+            print(f"Setting up RAG with {len(current)} files from {data_dir}")
+            
+            indexed = {path: entry.get("fingerprint") for path, entry in indexed_files.items()}
+            if hybrid_query_engine is not None and indexed == current:
+                print("RAG indexes are up to date.")
+                return True
+            
+            # Work on a copy loaded from storage; the live indexes stay untouched
+            # until the new query engine is swapped in below
+            storage, vector, keyword, manifest = load_or_create_indexes()
+            
+            changed = [path for path, fingerprint in current.items()
+                       if manifest.get(path, {}).get("fingerprint") != fingerprint]
+            removed = [path for path in manifest if path not in current]
+            
+            # Drop the nodes of files that changed or disappeared
+            for path in removed + changed:
+                for doc_id in manifest.pop(path, {}).get("doc_ids", []):
+                    keyword.delete_ref_doc(doc_id)
+                    vector.delete_ref_doc(doc_id, delete_from_docstore=True)
+            
+            if changed:
+                print(f"Indexing {len(changed)} new or changed files...")
+                parser = SimpleNodeParser.from_defaults(
+                    chunk_size=1000,  # Smaller chunks for better retrieval
+                    chunk_overlap=200,  # Some overlap to maintain context
+                )
+                for path in changed:
+                    try:
+                        documents = SimpleDirectoryReader(input_files=[path], filename_as_id=True).load_data()
+                    except Exception as e:
+                        print(f"Error loading {path}: {e}")
+                        continue
+                    new_nodes = parser.get_nodes_from_documents(documents)
+                    vector.insert_nodes(new_nodes)
+                    keyword.insert_nodes(new_nodes)
+                    manifest[path] = {
+                        "fingerprint": current[path],
+                        "doc_ids": [document.doc_id for document in documents],
+                    }
+            
+            if changed or removed:
+                print("Saving indexes to storage...")
+                storage.persist(persist_dir=STORAGE_DIR)
+                with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+                    json.dump(manifest, f)
+            
+            # Every indexed node is kept in the shared docstore, so BM25 needs no re-read
+            all_nodes = list(storage.docstore.docs.values())
+            if not all_nodes:
+                print("No content could be indexed")
                 return False
 
-            # Parse documents into nodes for BM25 with proper chunking
-            print("Parsing documents into nodes with chunking...")
-            parser = SimpleNodeParser.from_defaults(
-                chunk_size=1000,  # Smaller chunks for better retrieval
-                chunk_overlap=200,  # Some overlap to maintain context
-            )
-            nodes = parser.get_nodes_from_documents(documents)
+            print("Creating retrievers...")
+            # Create retrievers with smaller top_k to reduce context size
+            vector_retriever = vector.as_retriever(similarity_top_k=3)
+            keyword_retriever = keyword.as_retriever(similarity_top_k=3)
+            bm25_retriever = load_or_build_bm25(all_nodes, rebuild=bool(changed or removed))
 
-            print("Creating indexes...")
-            # Create vector store index from nodes (with chunking)
-            vector_index = VectorStoreIndex(nodes, embed_model=Settings.embed_model)
-            
-            # Create keyword table index from nodes
-            keyword_index = SimpleKeywordTableIndex(nodes)
+            # Instantiate the hybrid retriever
+            hybrid_retriever = HybridRetriever([vector_retriever, keyword_retriever, bm25_retriever])
+
+            # Create hybrid query engine
+            query_engine = RetrieverQueryEngine.from_args(
+                retriever=hybrid_retriever,
+                llm=Settings.llm,
+            )
             
-            # Save indexes to storage
-            print("Saving indexes to storage...")
-            vector_index.set_index_id("vector")
-            keyword_index.set_index_id("keyword")
-            vector_index.storage_context.persist(persist_dir=storage_dir)
-            keyword_index.storage_context.persist(persist_dir=storage_dir)
-
-        print("Creating retrievers...")
-        # Create retrievers with smaller top_k to reduce context size
-        vector_retriever = vector_index.as_retriever(similarity_top_k=3)
-        keyword_retriever = keyword_index.as_retriever(similarity_top_k=3)
-        bm25_retriever = BM25Retriever.from_defaults(nodes=nodes, similarity_top_k=3)
-
-        # Instantiate the hybrid retriever
-        hybrid_retriever = HybridRetriever([vector_retriever, keyword_retriever, bm25_retriever])
-
-        # Create hybrid query engine
-        hybrid_query_engine = RetrieverQueryEngine.from_args(
-            retriever=hybrid_retriever,
-            llm=Settings.llm,
-        )
-
-        print("RAG system setup completed successfully!")
-        return True
+            # Swap the updated indexes in; questions already running keep the old engine
+            storage_context, vector_index, keyword_index = storage, vector, keyword
+            nodes, indexed_files, hybrid_query_engine = all_nodes, manifest, query_engine
+            if changed or removed:
+                # Cached answers were drawn from the old content
+                answer_cache.clear()
+                prompt_cache.clear()
+
+            print("RAG system setup completed successfully!")
+            return True
         
-    except Exception as e:
-        print(f"Error setting up RAG system: {e}")
-        return False
+        except Exception as e:
+            print(f"Error setting up RAG system: {e}")
+            return False
 
-async def search_documents_with_context(query: str) -> str:
-    """Search through documents using hybrid retrieval with conversation context"""
-    global hybrid_query_engine, conversation_history
+# Conversation context sent with each question: at most this many recent
+# exchanges, newest first, within a rough token budget (~4 characters per token)
+HISTORY_EXCHANGES = 4
+HISTORY_TOKEN_BUDGET = 1500
+MAX_HISTORY = 10
+
+def estimate_tokens(text):
+    return len(text) // 4
+
+def format_history(history):
+    """Render the newest exchanges that fit in HISTORY_TOKEN_BUDGET, oldest first"""
+    exchanges = []
+    used = 0
+    for exchange in reversed(history[-HISTORY_EXCHANGES:]):
+        text = f"User: {exchange['user']}\nAssistant: {exchange['assistant']}"
+        used += estimate_tokens(text)
+        if used > HISTORY_TOKEN_BUDGET:
+            if not exchanges:
+                # Always keep (the start of) the latest exchange
+                exchanges.append(text[:HISTORY_TOKEN_BUDGET * 4])
+            break
+        exchanges.append(text)
+    return "\n".join(reversed(exchanges))
+
+def record_exchange(conversation_history, query, answer):
+    """Append an exchange, keeping only the last MAX_HISTORY to prevent context overflow"""
+    conversation_history.append({"user": query, "assistant": answer})
+    if len(conversation_history) > MAX_HISTORY:
+        conversation_history.pop(0)
+
+def reset_conversation(user_id=None):
+    """Forget a user's conversation, so their next question is answered standalone"""
+    conversation_histories.pop(user_id, None)
+
+async def search_documents_with_context(query: str, user_id=None) -> str:
+    """Search through documents using hybrid retrieval with the user's conversation context"""
+    global hybrid_query_engine
     
     if hybrid_query_engine is None:
         return "RAG system not initialized. Please run setup_news_rag first."
     
     try:
+        conversation_history = conversation_histories.setdefault(user_id, [])
+        
         # Build context-aware query
         if conversation_history:
             # Include recent conversation history for context
-            recent_history = conversation_history[-4:]  # Last 4 exchanges
             context_prompt = f"""
 Previous conversation:
-{chr(10).join([f"User: {h['user']}" + chr(10) + f"Assistant: {h['assistant']}" for h in recent_history])}
+{format_history(conversation_history)}
 
 Current question: {query}
 
@@ -186,28 +425,45 @@ Please answer the current question, considering the conversation context above.
 """
         else:
             context_prompt = query
+        
+        # Only standalone questions (the first one after a delivery, from any user)
+        # are cached; follow-ups depend on the conversation and always run the engine
+        standalone = not conversation_history
+        if standalone:
+            # Same question as before: a pure dict hit, no embedding or LLM call
+            cached_answer = prompt_cache.get(query)
+            if cached_answer is not None:
+                prompt_cache.move_to_end(query)
+                record_exchange(conversation_history, query, cached_answer)
+                return cached_answer
             
-        response = await hybrid_query_engine.aquery(context_prompt)
+            # Reuse the answer to a near-identical recent question
+            query_embedding = await asyncio.to_thread(Settings.embed_model.get_query_embedding, query)
+            entities = query_entities(query)
+            cached_answer = answer_cache.lookup(query_embedding, entities)
+            if cached_answer is not None:
+                record_exchange(conversation_history, query, cached_answer)
+                return cached_answer
+            
+        response = str(await hybrid_query_engine.aquery(context_prompt))
         
         # Add to conversation history
-        conversation_history.append({
-            "user": query,
-            "assistant": str(response)
-        })
+        record_exchange(conversation_history, query, response)
         
-        # Keep only last 10 exchanges to prevent context overflow
-        if len(conversation_history) > 10:
-            conversation_history.pop(0)
-            
-        return str(response)
+        if standalone:
+            answer_cache.add(query_embedding, entities, response)
+            prompt_cache[query] = response
+            if len(prompt_cache) > PROMPT_CACHE_SIZE:
+                prompt_cache.popitem(last=False)
+        return response
     except Exception as e:
         return f"Error searching documents: {str(e)}"
 
-async def answer_news_question(question):
+async def answer_news_question(question, user_id=None):
     """Answer a question about the news using the RAG system"""
     try:
         # Use the existing search function
-        return await search_documents_with_context(question)
+        return await search_documents_with_context(question, user_id)
     except Exception as e:
         return f"Error answering question: {str(e)}"
 
@@ -1,192 +1,540 @@
 import os
+import asyncio
+import hashlib
+import logging
+import logging.handlers
+import queue
+import re
+import sqlite3
+import atexit
+import threading
+import time
+import aiohttp
+import orjson
 import dotenv as env
-import requests
+from functools import lru_cache
+import lxml.html
+from lxml import etree
+from aiohttp_client_cache import CachedSession, SQLiteBackend
 from google import genai
 from google.genai import types
-from newspaper import Article
+from newspaper import Article, Config, nlp
 
 env.load_dotenv()
 
-client = None
+# Progress is logged through a queue and written by a background listener, so
+# concurrent summary/fetch tasks never block on stdout
+log_queue = queue.Queue(-1)
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter("%(message)s"))
+log_listener = logging.handlers.QueueListener(log_queue, log_handler)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.handlers.QueueHandler(log_queue))
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+GNEWS_SEARCH_URL = "https://gnews.io/api/v4/search"
+
+# GNews requests in flight start at FETCH_CONCURRENCY and adapt (AIMD): the limit
+# grows by GNEWS_LIMIT_INCREASE per fast response up to GNEWS_MAX_CONCURRENCY and is
+# multiplied by GNEWS_LIMIT_DECREASE whenever GNews rate limits us
+FETCH_CONCURRENCY = 16
+GNEWS_MAX_CONCURRENCY = 32
+GNEWS_LIMIT_INCREASE = 0.5
+GNEWS_LIMIT_DECREASE = 0.5
+GNEWS_LATENCY_TARGET = 2.0
+# Pause all GNews requests when told to by Retry-After, or when under 10% of the quota remains
+GNEWS_MAX_PAUSE = 60
+GNEWS_LOW_QUOTA = 0.1
+GNEWS_LOW_QUOTA_PAUSE = 1.0
+
+# GNews requests give up on a stalled connect or read, and transient failures
+# (rate limiting, 5xx, network errors) are retried with exponential backoff
+GNEWS_TIMEOUT = aiohttp.ClientTimeout(sock_connect=3, sock_read=10)
+GNEWS_RETRIES = 3
+GNEWS_RETRY_BACKOFF = 0.3
+GNEWS_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# GNews responses are cached on disk for an hour so repeat keywords skip the API
+GNEWS_CACHE_PATH = os.path.join("cache", "gnews_cache")
+GNEWS_CACHE_TTL = 3600
+
+# Number of articles downloaded and parsed at once
+SUMMARY_CONCURRENCY = 16
+
+# Summaries are written by Gemini, several articles per call; article text is
+# capped to keep each batch prompt small
+SUMMARY_BATCH_SIZE = 10
+SUMMARY_BATCH_CONCURRENCY = 4
+SUMMARY_TEXT_LIMIT = 4000
+SUMMARY_INSTRUCTION = "You summarize news articles. Summarize each article you are given in 3 sentences. " \
+    "Return only a JSON array of strings with exactly one summary per article, in the order the articles were given."
+
+# Article pages are downloaded with newspaper3k's own user agent and timeout;
+# image fetching is off since only the text is summarized
+ARTICLE_CONFIG = Config()
+ARTICLE_CONFIG.fetch_images = False
+ARTICLE_HEADERS = {"User-Agent": ARTICLE_CONFIG.browser_user_agent}
+ARTICLE_TIMEOUT = aiohttp.ClientTimeout(total=ARTICLE_CONFIG.request_timeout)
+
+# Article summaries are cached on disk for a week, keyed by URL hash
+SUMMARY_CACHE_PATH = os.path.join("cache", "summary_cache.sqlite")
+SUMMARY_CACHE_TTL = 7 * 86400
+SUMMARY_FAILED = "Summary extraction failed"
+
+# Article text is read straight from the <p> elements inside <article>/<main>;
+# pages with less text than ARTICLE_MIN_TEXT there fall back to newspaper3k's extractor
+ARTICLE_PARAGRAPHS = etree.XPath("//article//p | //main//p")
+ARTICLE_OG_TITLE = etree.XPath("string(//meta[@property='og:title']/@content)")
+ARTICLE_MIN_TEXT = 500
+# lxml refuses str input that carries an encoding declaration; the text is already decoded
+XML_DECLARATION_RE = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+# Summaries only need the stopword list loaded once, not on every article
+nlp.load_stopwords(ARTICLE_CONFIG.get_language())
+
+# Gemini keywords are cached on disk for a day so a repeated query skips the call
+KEYWORD_CACHE_PATH = os.path.join("cache", "keyword_cache.json")
+KEYWORD_CACHE_TTL = 86400
+
+# One keyword per non-blank line, trimmed, with any "-", "*", "•" or "1." / "1)" list marker dropped
+KEYWORD_LINE_RE = re.compile(r"^[ \t]*(?:(?:[-*•]|\d+[.)])[ \t]+)?(\S(?:[^\r\n]*\S)?)", re.MULTILINE)
 
 # Global variable to store user query (set by main.py)
 user_query = ""
 
+@lru_cache(maxsize=1)
 def get_gemini_client():
-    """Get or initialize the Gemini client"""
-    global client
-    if client is None:
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable not set")
-        client = genai.Client(api_key=api_key)
-    return client
+    """Get or initialize the Gemini client (created once, on first use)"""
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY environment variable not set")
+    return genai.Client(api_key=api_key)
+
+@lru_cache(maxsize=1)
+def get_gnews_api_key():
+    """Read the GNews API key from the environment once"""
+    gnews_api_key = os.getenv("GNEWS_API_KEY")
+    if not gnews_api_key:
+        raise ValueError("GNEWS_API_KEY environment variable not set")
+    return gnews_api_key
 
 def set_user_query(query):
     """Set the user query for search"""
     global user_query
     user_query = query
 
-def extract_article_summary(url):
-    """
-    Extract article summary using newspaper3k
-    """
+def dedupe_keywords(keywords):
+    """Drop keywords whose words (ignoring case, spacing and order) all appear in an earlier kept keyword"""
+    kept = []
+    kept_words = []
+    for keyword in keywords:
+        words = frozenset(keyword.lower().split())
+        if any(words <= prior for prior in kept_words):
+            continue
+        kept.append(keyword)
+        kept_words.append(words)
+    return kept
+
+def load_keyword_cache():
+    """Load the {query hash: {"time", "keywords"}} keyword cache"""
+    try:
+        with open(KEYWORD_CACHE_PATH, "rb") as f:
+            return orjson.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+
+def generate_keywords(query):
+    """Ask Gemini for search keywords for a query, reusing a recent answer for the same query"""
+    key = hashlib.sha1(query.strip().lower().encode("utf-8")).hexdigest()
+    cache = load_keyword_cache()
+    entry = cache.get(key)
+    if entry and time.time() - entry["time"] < KEYWORD_CACHE_TTL:
+        logger.info("Using cached keywords for this query")
+        return entry["keywords"]
+    
+    client = get_gemini_client()
+    response = client.models.generate_content(
+        model="gemini-2.0-flash",
+        config=types.GenerateContentConfig(
+            system_instruction="You are an expert in providing news articles. Based on the user query, create a list of top 20 keywords that are highly relevant to the query." \
+            "The keywords can contain more than one word also to keep the users context. Return only the keywords, one per line, without numbering or additional text.",),
+        contents=query,
+    )
+    
+    # Drop expired entries while rewriting the cache
+    now = time.time()
+    cache = {k: v for k, v in cache.items() if now - v["time"] < KEYWORD_CACHE_TTL}
+    cache[key] = {"time": now, "keywords": response.text}
+    os.makedirs(os.path.dirname(KEYWORD_CACHE_PATH), exist_ok=True)
+    # Write to a temp file and swap it in so concurrent searches never see a partial file
+    tmp_path = f"{KEYWORD_CACHE_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(orjson.dumps(cache))
+    os.replace(tmp_path, KEYWORD_CACHE_PATH)
+    return response.text
+
+def parse_article(url, html):
+    """Parse an article's title and body text from its html in one lxml pass, using newspaper3k when that finds too little"""
+    try:
+        tree = lxml.html.fromstring(XML_DECLARATION_RE.sub('', html, count=1))
+    except (ValueError, etree.ParserError):
+        tree = None
+    if tree is not None:
+        paragraphs = (paragraph.text_content().strip() for paragraph in ARTICLE_PARAGRAPHS(tree))
+        text = "\n\n".join(paragraph for paragraph in paragraphs if paragraph)
+        if len(text) >= ARTICLE_MIN_TEXT:
+            title = ARTICLE_OG_TITLE(tree).strip() or (tree.findtext('.//title') or '').strip()
+            return title, text
+    
+    article = Article(url, config=ARTICLE_CONFIG)
+    article.download(input_html=html)
+    article.parse()
+    return article.title, article.text
+
+def local_summaries(batch):
+    """newspaper3k's extractive summaries for a batch of (title, text) articles, used when Gemini fails"""
+    summaries = []
+    for title, text in batch:
+        try:
+            # Same summary as article.nlp(), without its unused keyword passes
+            sentences = nlp.summarize(title=title, text=text, max_sents=ARTICLE_CONFIG.MAX_SUMMARY_SENT)
+            summaries.append('\n'.join(sentences)[:ARTICLE_CONFIG.MAX_SUMMARY])
+        except Exception as e:
+            logger.error("Error extracting summary for '%s': %s", title, e)
+            summaries.append(SUMMARY_FAILED)
+    return summaries
+
+async def fetch_article(http, url):
+    """Download an article through the shared session and parse it in a worker thread, or None on failure"""
     try:
-        article = Article(url)
-        article.download()
-        article.parse()
-        article.nlp()
-        return article.summary
+        # Article pages are not worth keeping in the GNews cache
+        async with http.disabled():
+            async with http.get(url, headers=ARTICLE_HEADERS, timeout=ARTICLE_TIMEOUT) as response:
+                response.raise_for_status()
+                html = await response.text()
+        return await asyncio.to_thread(parse_article, url, html)
     except Exception as e:
-        print(f"Error extracting summary from {url}: {e}")
-        return "Summary extraction failed"
+        logger.error("Error extracting summary from %s: %s", url, e)
+        return None
 
-def get_news_for_keyword(keyword, websites=None, max_articles=10, from_specific_sites=True):
-    """Get news articles for a specific keyword"""
-    results = []
-    gnews_api_key = os.getenv("GNEWS_API_KEY")
+async def summarize_batch(batch):
+    """Summarize a batch of (title, text) articles with one Gemini call, returning (summaries, from_gemini)"""
+    contents = "\n\n".join(
+        f"Article {i}\nTitle: {title}\n{text[:SUMMARY_TEXT_LIMIT]}"
+        for i, (title, text) in enumerate(batch, 1)
+    )
+    try:
+        response = await get_gemini_client().aio.models.generate_content(
+            model="gemini-2.0-flash",
+            config=types.GenerateContentConfig(
+                system_instruction=SUMMARY_INSTRUCTION,
+                response_mime_type="application/json",
+            ),
+            contents=contents,
+        )
+        summaries = orjson.loads(response.text)
+        if isinstance(summaries, list) and len(summaries) == len(batch) and all(isinstance(summary, str) for summary in summaries):
+            return summaries, True
+        logger.warning("Gemini returned a malformed summary batch, using local summaries")
+    except Exception as e:
+        logger.error("Error generating summaries with Gemini, using local summaries: %s", e)
+    return await asyncio.to_thread(local_summaries, batch), False
+
+class GNewsThrottle:
+    """Adaptive concurrency limit for GNews requests, fed back from each response"""
+    def __init__(self, initial, maximum):
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        # Honour any pause before taking a slot, so a paused request holds no slot
+        while (delay := self.paused_until - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + min(seconds, GNEWS_MAX_PAUSE))
+
+    def observe(self, response, latency):
+        """Adjust the limit from a GNews response and its latency"""
+        if getattr(response, "from_cache", False):
+            return
+        if response.status == 429:
+            self.limit = max(1.0, self.limit * GNEWS_LIMIT_DECREASE)
+            try:
+                self.pause(float(response.headers.get("Retry-After", 0)))
+            except ValueError:
+                pass
+            return
+        
+        try:
+            remaining = int(response.headers["x-ratelimit-remaining"])
+            quota = int(response.headers["x-ratelimit-limit"])
+            if quota and remaining < quota * GNEWS_LOW_QUOTA:
+                self.pause(GNEWS_LOW_QUOTA_PAUSE)
+        except (KeyError, ValueError):
+            pass
+        
+        if response.status == 200 and latency < GNEWS_LATENCY_TARGET:
+            self.limit = min(float(self.maximum), self.limit + GNEWS_LIMIT_INCREASE)
+
+def open_gnews_session():
+    """Open a pooled aiohttp session backed by the on-disk GNews cache (call inside the event loop)"""
+    # The API token is left out of cache keys
+    cache = SQLiteBackend(GNEWS_CACHE_PATH, expire_after=GNEWS_CACHE_TTL, ignored_params=["token"])
+    connector = aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60)
+    return CachedSession(cache=cache, connector=connector, timeout=GNEWS_TIMEOUT)
+
+async def fetch_gnews_articles(http, throttle, keyword, gnews_api_key, max_articles, site=None):
+    """Fetch raw GNews search results for a keyword, optionally restricted to one site"""
+    params = {
+        "q": keyword,
+        "token": gnews_api_key,
+        "lang": "en",
+        "max": str(max_articles)
+    }
+    if site:
+        params["site"] = site
     
-    if not gnews_api_key:
-        raise ValueError("GNEWS_API_KEY environment variable not set")
+    error = None
+    for attempt in range(GNEWS_RETRIES + 1):
+        if attempt:
+            # Back off outside the throttle so other keywords keep going
+            await asyncio.sleep(GNEWS_RETRY_BACKOFF * 2 ** (attempt - 1))
+        try:
+            async with throttle:
+                started = time.monotonic()
+                async with http.get(GNEWS_SEARCH_URL, params=params) as response:
+                    throttle.observe(response, time.monotonic() - started)
+                    if response.status == 200:
+                        return orjson.loads(await response.read()).get("articles", [])
+                    if response.status not in GNEWS_RETRY_STATUSES:
+                        return []
+                    error = f"HTTP {response.status}"
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            error = e
+        except Exception as e:
+            error = e
+            break
+    
+    logger.error("Error fetching news for keyword '%s' from %s: %s", keyword, site or 'general web', error)
+    return []
+
+async def get_news_for_keyword(http, throttle, keyword, websites=None, max_articles=10, from_specific_sites=True):
+    """Get news article metadata for a specific keyword (summaries are added by add_summaries)"""
+    results = []
+    gnews_api_key = get_gnews_api_key()
     
     if from_specific_sites and websites:
-        # Search from specific tech websites
-        for site in websites:
+        # Search from specific tech websites, fetching every site concurrently
+        site_articles = await asyncio.gather(*(
+            fetch_gnews_articles(http, throttle, keyword, gnews_api_key, max_articles, site)
+            for site in websites
+        ))
+        
+        for site, articles in zip(websites, site_articles):
+            for article in articles:
+                if len(results) >= max_articles:
+                    break
+                
+                results.append({
+                    'title': article.get('title'),
+                    'description': article.get('description'),
+                    'url': article.get('url'),
+                    'publishedAt': article.get('publishedAt'),
+                    'source': site,
+                    'keyword': keyword,
+                    'source_type': 'tech_website'
+                })
+    else:
+        # Search from the whole web (no site restriction)
+        for article in await fetch_gnews_articles(http, throttle, keyword, gnews_api_key, max_articles):
             if len(results) >= max_articles:
                 break
-                
-            url = f"https://gnews.io/api/v4/search"
-            params = {
-                "q": keyword,
-                "token": gnews_api_key,
-                "lang": "en",
-                "max": max_articles,
-                "site": site
-            }
             
-            try:
-                response = requests.get(url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    for article in data.get("articles", []):
-                        if len(results) >= max_articles:
-                            break
-                        
-                        # Extract summary for each article
-                        print(f"Extracting summary for: {article.get('title', 'Unknown Title')}")
-                        summary = extract_article_summary(article.get('url'))
+            results.append({
+                'title': article.get('title'),
+                'description': article.get('description'),
+                'url': article.get('url'),
+                'publishedAt': article.get('publishedAt'),
+                'source': article.get('source', {}).get('name', 'Unknown'),
+                'keyword': keyword,
+                'source_type': 'general_web'
+            })
+    
+    return results
+
+def open_summary_cache():
+    """Open the on-disk {url hash: summary} cache in autocommit mode, dropping expired entries"""
+    os.makedirs(os.path.dirname(SUMMARY_CACHE_PATH), exist_ok=True)
+    # Autocommit, so no transaction (and write lock) outlives a single statement
+    db = sqlite3.connect(SUMMARY_CACHE_PATH, isolation_level=None)
+    db.execute("CREATE TABLE IF NOT EXISTS summaries (key TEXT PRIMARY KEY, summary TEXT NOT NULL, created REAL NOT NULL)")
+    db.execute("DELETE FROM summaries WHERE created < ?", (time.time() - SUMMARY_CACHE_TTL,))
+    return db
+
+def load_cached_summaries(keys):
+    """Return the {key: summary} entries of the summary cache that are still fresh"""
+    db = open_summary_cache()
+    try:
+        placeholders = ",".join("?" * len(keys))
+        return dict(db.execute(f"SELECT key, summary FROM summaries WHERE key IN ({placeholders})", keys))
+    finally:
+        db.close()
+
+def store_summaries(rows):
+    """Write (key, summary, created) rows to the summary cache in one short transaction"""
+    db = open_summary_cache()
+    try:
+        db.execute("BEGIN")
+        db.executemany("INSERT OR REPLACE INTO summaries VALUES (?, ?, ?)", rows)
+        db.execute("COMMIT")
+    finally:
+        db.close()
+
+async def add_summaries(http, articles):
+    """Fill in cached summaries, then download the rest and summarize them with Gemini in batches"""
+    keys = [hashlib.sha1(str(article['url']).encode("utf-8")).hexdigest() for article in articles]
+    fetch_semaphore = asyncio.Semaphore(SUMMARY_CONCURRENCY)
+    batch_semaphore = asyncio.Semaphore(SUMMARY_BATCH_CONCURRENCY)
+    
+    async def fetch(article):
+        async with fetch_semaphore:
+            logger.info("Extracting summary for: %s", article.get('title') or 'Unknown Title')
+            return await fetch_article(http, article['url'])
+    
+    async def summarize(batch):
+        async with batch_semaphore:
+            return await summarize_batch([parsed for _, _, parsed in batch])
+    
+    # The cache is only open while reading and writing, never across downloads
+    cached = await asyncio.to_thread(load_cached_summaries, keys)
+    for article, key in zip(articles, keys):
+        if key in cached:
+            article['extracted_summary'] = cached[key]
+    logger.info("Reusing %s cached summaries", len(cached))
+    
+    missing = [(article, key) for article, key in zip(articles, keys) if key not in cached]
+    parsed_articles = await asyncio.gather(*(fetch(article) for article, _ in missing))
+    
+    # Failures and local fallback summaries are retried on the next run rather than cached
+    parsed = []
+    for (article, key), parsed_article in zip(missing, parsed_articles):
+        if parsed_article is None:
+            article['extracted_summary'] = SUMMARY_FAILED
+        else:
+            parsed.append((article, key, parsed_article))
+    
+    batches = [parsed[i:i + SUMMARY_BATCH_SIZE] for i in range(0, len(parsed), SUMMARY_BATCH_SIZE)]
+    batch_summaries = await asyncio.gather(*(summarize(batch) for batch in batches))
+    
+    now = time.time()
+    fresh = []
+    for batch, (summaries, from_gemini) in zip(batches, batch_summaries):
+        for (article, key, _), summary in zip(batch, summaries):
+            article['extracted_summary'] = summary
+            if from_gemini:
+                fresh.append((key, summary, now))
+    
+    if fresh:
+        await asyncio.to_thread(store_summaries, fresh)
+
+async def collect_articles(keywords_list, limit=200):
+    """Fetch articles for every keyword concurrently, keep the first `limit` unique ones and summarize them"""
+    all_articles = []
+    seen_urls = set()
+    
+    async with open_gnews_session() as http:
+        throttle = GNewsThrottle(FETCH_CONCURRENCY, GNEWS_MAX_CONCURRENCY)
+        tasks = [
+            asyncio.create_task(get_news_for_keyword(http, throttle, keyword, None, max_articles=10, from_specific_sites=False))
+            for keyword in keywords_list
+        ]
+        try:
+            # Results are merged in keyword order
+            for keyword, task in zip(keywords_list, tasks):
+                articles = await task
+                # Add unique articles only
+                for article in articles:
+                    if article['url'] not in seen_urls and len(all_articles) < limit:
+                        seen_urls.add(article['url'])
+                        all_articles.append(article)
                         
-                        results.append({
-                            'title': article.get('title'),
-                            'description': article.get('description'),
-                            'url': article.get('url'),
-                            'publishedAt': article.get('publishedAt'),
-                            'source': site,
-                            'keyword': keyword,
-                            'source_type': 'tech_website',
-                            'extracted_summary': summary
-                        })
-            except Exception as e:
-                print(f"Error fetching news for keyword '{keyword}' from {site}: {e}")
-                continue
-    else:
-        # Search from the whole web (no site restriction)
-        url = f"https://gnews.io/api/v4/search"
-        params = {
-            "q": keyword,
-            "token": gnews_api_key,
-            "lang": "en",
-            "max": max_articles
-        }
+                logger.info("Found %s articles for '%s', Total unique articles: %s", len(articles), keyword, len(all_articles))
+                if len(all_articles) >= limit:
+                    break
+        finally:
+            # Drop keywords that are still running once we have enough articles
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
         
-        try:
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                for article in data.get("articles", []):
-                    if len(results) >= max_articles:
-                        break
-                    
-                    # Extract summary for each article
-                    print(f"Extracting summary for: {article.get('title', 'Unknown Title')}")
-                    summary = extract_article_summary(article.get('url'))
-                    
-                    results.append({
-                        'title': article.get('title'),
-                        'description': article.get('description'),
-                        'url': article.get('url'),
-                        'publishedAt': article.get('publishedAt'),
-                        'source': article.get('source', {}).get('name', 'Unknown'),
-                        'keyword': keyword,
-                        'source_type': 'general_web',
-                        'extracted_summary': summary
-                    })
-        except Exception as e:
-            print(f"Error fetching news for keyword '{keyword}' from general web: {e}")
+        # Summaries are only extracted for the unique articles that were kept
+        await add_summaries(http, all_articles)
     
-    return results
+    return all_articles
 
-def run_search_process():
+async def run_search_process():
     """Run the complete search process"""
     global user_query
     
-    print(f"🔍 Starting search for: {user_query}")
+    logger.info("🔍 Starting search for: %s", user_query)
     
     # Generate keywords using Gemini
-    client = get_gemini_client()
-    response = client.models.generate_content(
-        model="gemini-2.0-flash",
-        config=types.GenerateContentConfig(
-            system_instruction="You are an expert in providing news articles. Based on the user query, create a list of top 20 keywords that are highly relevant to the query." \
-            "The keywords can contain more than one word also to keep the users context. Return only the keywords, one per line, without numbering or additional text.",),
-        contents=user_query,
-    )
-
-    keywords_text = response.text
-    keywords_list = [keyword.strip() for keyword in keywords_text.split('\n') if keyword.strip()]
+    keywords_text = generate_keywords(user_query)
+    keywords_list = KEYWORD_LINE_RE.findall(keywords_text)
+    # Overlapping keywords would only repeat GNews calls for the same articles
+    unique_keywords = dedupe_keywords(keywords_list)
+    if len(unique_keywords) < len(keywords_list):
+        logger.info("Dropped %s overlapping keywords", len(keywords_list) - len(unique_keywords))
+    keywords_list = unique_keywords
 
     # Collect 200 unique articles from general web
-    all_articles = []
-    seen_urls = set()
-
-    print("Fetching articles from the web...")
-    for keyword in keywords_list:
-        if len(all_articles) >= 200:
-            break
-            
-        print(f"Fetching news for keyword: {keyword}")
-        articles = get_news_for_keyword(keyword, None, max_articles=10, from_specific_sites=False)
-        
-        # Add unique articles only
-        for article in articles:
-            if article['url'] not in seen_urls and len(all_articles) < 200:
-                seen_urls.add(article['url'])
-                all_articles.append(article)
-                
-        print(f"Found {len(articles)} articles for '{keyword}', Total unique articles: {len(all_articles)}")
+    logger.info("Fetching articles from the web...")
+    all_articles = await collect_articles(keywords_list, limit=200)
 
     # Ensure data folder exists
     os.makedirs("data", exist_ok=True)
 
-    # Save to file in data folder
+    # Build the whole report first, then save it to the data folder in one write
+    lines = [
+        f"Search Query: {user_query}\n",
+        f"Total Articles Found: {len(all_articles)}\n",
+        "="*50 + "\n\n",
+    ]
+    for idx, article in enumerate(all_articles, 1):
+        lines.append(
+            f"Article {idx}\n"
+            f"Keyword: {article['keyword']}\n"
+            f"Title: {article['title']}\n"
+            f"Description: {article['description']}\n"
+            f"URL: {article['url']}\n"
+            f"Summary:\n{article['extracted_summary']}\n\n"
+            f"Published At: {article['publishedAt']}\n"
+            f"Source: {article['source']}\n"
+            + "-"*40 + "\n"
+        )
+    
     with open("data/news_results.txt", "w", encoding="utf-8") as f:
-        f.write(f"Search Query: {user_query}\n")
-        f.write(f"Total Articles Found: {len(all_articles)}\n")
-        f.write("="*50 + "\n\n")
-        
-        for idx, article in enumerate(all_articles, 1):
-            f.write(f"Article {idx}\n")
-            f.write(f"Keyword: {article['keyword']}\n")
-            f.write(f"Title: {article['title']}\n")
-            f.write(f"Description: {article['description']}\n")
-            f.write(f"URL: {article['url']}\n")
-            f.write(f"Summary:\n{article['extracted_summary']}\n\n")
-            f.write(f"Published At: {article['publishedAt']}\n")
-            f.write(f"Source: {article['source']}\n")
-            f.write("-"*40 + "\n")
-
-    print(f"\n✅ Results saved to data/news_results.txt")
-    print(f"Total unique articles: {len(all_articles)}")
+        f.write(''.join(lines))
+
+    logger.info("\n✅ Results saved to data/news_results.txt")
+    logger.info("Total unique articles: %s", len(all_articles))
     
     return True
 
@@ -196,8 +544,8 @@ def main():
     if not user_query:
         raise ValueError("user_query must be set before calling main()")
     
-    # Run the search process
-    return run_search_process()
+    # Run the search process on its own event loop
+    return asyncio.run(run_search_process())
 
 # If run directly (for testing)
 if __name__ == "__main__":